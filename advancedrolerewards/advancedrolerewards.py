@@ -10,6 +10,9 @@ import io
 
 log = logging.getLogger("red.advancedrolerewards")
 
+# Largest settings import we are willing to buffer and parse (bytes)
+MAX_IMPORT_SIZE = 5_000_000
+
 class AdvancedRoleRewards(commands.Cog):
     """
     Grant role rewards based on level and tenure.
@@ -752,7 +755,13 @@ class AdvancedRoleRewards(commands.Cog):
             return await ctx.send("Please attach a JSON file.")
         
         file = ctx.message.attachments[0]
-        content = await file.read()
+        # Reject oversized uploads before downloading anything
+        if file.size > MAX_IMPORT_SIZE:
+            return await ctx.send(f"That file is too large to import (limit is {MAX_IMPORT_SIZE // 1_000_000} MB).")
+        try:
+            content = await file.read()
+        except discord.HTTPException:
+            return await ctx.send("Failed to download the attached file.")
         
         try:
             data = json.loads(content)
@@ -92,6 +92,19 @@ class CraftyAllowlist(commands.Cog):
         self.config.register_user(**default_user)
         self.config.register_member(**default_member)
 
+        # One HTTP session for every Crafty API call, created lazily
+        self._session: typing.Optional[aiohttp.ClientSession] = None
+
+    def cog_unload(self):
+        if self._session is not None and not self._session.closed:
+            self.bot.loop.create_task(self._session.close())
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared ClientSession, reopening it if it was closed."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+        return self._session
+
     async def send_crafty_command(self, guild: discord.Guild, command: str) -> bool:
         """Helper to send stdin commands to Crafty API."""
         settings = await self.config.guild(guild).all()
@@ -109,13 +122,12 @@ class CraftyAllowlist(commands.Cog):
         endpoint = f"{url.rstrip('/')}/api/v2/servers/{server_id}/stdin"
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(endpoint, headers=headers, data=command, timeout=10) as response:
-                    if response.status in (200, 204):
-                        return True
-                    else:
-                        log.error(f"Crafty API Error: {response.status} - {await response.text()}")
-                        return False
+            async with self._get_session().post(endpoint, headers=headers, data=command) as response:
+                if response.status in (200, 204):
+                    return True
+                else:
+                    log.error(f"Crafty API Error: {response.status} - {await response.text()}")
+                    return False
         except Exception as e:
             log.exception(f"Exception connecting to Crafty API: {e}")
             return False
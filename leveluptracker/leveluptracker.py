@@ -2,16 +2,57 @@ import discord
 import logging
 import inspect
 import asyncio
-import statistics
+import functools
+import re
+import time
+from collections import OrderedDict, defaultdict
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Union, List, Tuple
+import numpy as np
+from typing import AsyncIterator, Dict, Iterator, Optional, Union, List, Tuple
 
 from redbot.core import commands, Config, checks
 from redbot.core.bot import Red
-from redbot.core.utils.chat_formatting import box, humanize_timedelta, pagify
+from redbot.core.utils.chat_formatting import box, humanize_timedelta
+
+try:
+    # Optional: only needed when a Redis cache URL is configured
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
 
 log = logging.getLogger("red.leveluptracker")
 
+LEVEL_CACHE_TTL = 60          # Seconds a fetched level stays fresh
+LEVEL_CACHE_MAX_SIZE = 50000  # Oldest entries are evicted past this size
+REDIS_KEY_TTL = 7 * 86400     # Seconds a Redis cache entry lives without a refresh
+
+NON_ASCII_RE = re.compile(r"[^\x00-\x7f]+")
+
+
+@functools.lru_cache(maxsize=4096)
+def _short_timedelta_cached(seconds: int) -> str:
+    """Format a duration in whole seconds into a short string (e.g., 1d 2h)."""
+    if seconds == 0:
+        return "0s"
+
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+
+    parts = []
+    if days:
+        parts.append(f"{days}d")
+    if hours:
+        parts.append(f"{hours}h")
+    if minutes:
+        parts.append(f"{minutes}m")
+    if seconds:
+        parts.append(f"{seconds}s")
+    
+    # Limit to 2 most significant units to keep tables clean
+    return " ".join(parts[:2])
+
+
 class LevelUpTracker(commands.Cog):
     """
     Track how long it takes users to level up using VertyCo's LevelUp cog.
@@ -23,8 +64,14 @@ class LevelUpTracker(commands.Cog):
         self.config = Config.get_conf(self, identifier=987123654, force_registration=True)
 
         # Default configuration
+        default_global = {
+            "redis_url": None,      # Optional Redis cache for level/join lookups
+            "redis_batch_size": 100,       # Flush early once this many updates are queued
+            "redis_flush_interval": 1.0    # Seconds between pipelined cache flushes
+        }
         default_guild = {
-            "initialized": False
+            "initialized": False,
+            "level_roles": {}       # Format: {"role_id": level_int} for LevelUp milestone roles
         }
         default_member = {
             "join_timestamp": None,
@@ -32,38 +79,60 @@ class LevelUpTracker(commands.Cog):
             "levels": {}            # Format: {"level_int": timestamp_float}
         }
 
+        self.config.register_global(**default_global)
         self.config.register_guild(**default_guild)
         self.config.register_member(**default_member)
 
+        # (guild_id, member_id) -> (level, expiry), ordered oldest first
+        self._level_cache: "OrderedDict[Tuple[int, int], Tuple[int, float]]" = OrderedDict()
+
+        self._init_locks: Dict[int, asyncio.Lock] = {}
+
+        self.redis = None
+        self._pending: List[Tuple[int, int, dict]] = []
+        self._flush_event = asyncio.Event()
+        self._batch_size = default_global["redis_batch_size"]
+        self._flush_interval = default_global["redis_flush_interval"]
+        self.bot.loop.create_task(self._connect_redis())
+        self._flush_task = self.bot.loop.create_task(self._flush_loop())
+
+    def cog_unload(self):
+        self._flush_task.cancel()
+        if self.redis is not None:
+            self.bot.loop.create_task(self._close_redis())
+
     async def red_delete_data_for_user(self, *, requester, user_id):
         """Handle data deletion request."""
         await self.config.user_from_id(user_id).clear()
+        # Drop the user's copies in the Redis cache, queued or already written
+        self._pending = [p for p in self._pending if p[1] != user_id]
+        if self.redis is not None:
+            try:
+                keys = [key async for key in self.redis.scan_iter(match=f"lut:*:{user_id}")]
+                if keys:
+                    await self.redis.delete(*keys)
+            except Exception as e:
+                log.error(f"Failed to purge Redis cache for user {user_id}: {e}")
 
     # --------------------------------------------------------------------------
     # Helper: Time Formatting
     # --------------------------------------------------------------------------
     def _short_timedelta(self, delta: timedelta) -> str:
         """Format timedelta into a short string (e.g., 1d 2h)."""
-        seconds = int(delta.total_seconds())
-        if seconds == 0:
-            return "0s"
-
-        days, seconds = divmod(seconds, 86400)
-        hours, seconds = divmod(seconds, 3600)
-        minutes, seconds = divmod(seconds, 60)
-
-        parts = []
-        if days:
-            parts.append(f"{days}d")
-        if hours:
-            parts.append(f"{hours}h")
-        if minutes:
-            parts.append(f"{minutes}m")
-        if seconds:
-            parts.append(f"{seconds}s")
-        
-        # Limit to 2 most significant units to keep tables clean
-        return " ".join(parts[:2])
+        return _short_timedelta_cached(int(delta.total_seconds()))
+
+    @staticmethod
+    def _level_stats(times: List[float]) -> Tuple[float, float]:
+        """
+        Mean and median of a level bucket from a single sorted array.
+        The sorted copy serves both the sum and the middle-element lookup.
+        """
+        arr = np.sort(np.asarray(times, dtype=np.float64))
+        n = len(arr)
+        mid = n // 2
+        mean = float(arr.sum()) / n
+        median = float(arr[mid]) if n % 2 else 0.5 * float(arr[mid - 1] + arr[mid])
+        return mean, median
 
     # --------------------------------------------------------------------------
     # Helper: Table Formatting & Sanitation
@@ -76,7 +145,7 @@ class LevelUpTracker(commands.Cog):
         if name.isascii():
              return name
         # Strip non-ascii chars that mess up width calculations
-        clean = name.encode("ascii", "ignore").decode("ascii").strip()
+        clean = NON_ASCII_RE.sub("", name).strip()
         return clean if clean else "Unknown"
 
     def _make_table(self, headers: list, rows: list) -> str:
@@ -86,37 +155,54 @@ class LevelUpTracker(commands.Cog):
         if not rows:
             return "No data available."
 
-        # Calculate column widths
-        col_widths = [len(h) for h in headers]
-        for row in rows:
-            for i, cell in enumerate(row):
-                cell_str = str(cell)
-                if len(cell_str) > col_widths[i]:
-                    col_widths[i] = len(cell_str)
-
-        # Build separator
-        separator = "+" + "+".join(["-" * (w + 2) for w in col_widths]) + "+"
+        # Stringify once so width calculation and formatting share the same strings
+        str_rows = [[str(c) for c in row] for row in rows]
+        separator, row_fmt = self._table_layout(headers, str_rows)
 
-        # Build Header
-        header_line = "|"
-        for i, h in enumerate(headers):
-            header_line += f" {h:<{col_widths[i]}} |"
+        header_line = row_fmt.format(*headers)
+        body = [row_fmt.format(*row) for row in str_rows]
 
-        # Build Rows
-        body = []
-        for row in rows:
-            line = "|"
-            for i, cell in enumerate(row):
-                line += f" {str(cell):<{col_widths[i]}} |"
-            body.append(line)
+        return "\n".join([separator, header_line, separator, *body, separator])
 
-        return f"{separator}\n{header_line}\n{separator}\n" + "\n".join(body) + f"\n{separator}"
+    def _make_paged_tables(self, headers: list, rows: list, page_length: int = 1900) -> Iterator[str]:
+        """
+        Yields self-contained tables of at most `page_length` characters each.
+        All pages share the same column widths, so nothing needs re-splitting.
+        """
+        if not rows:
+            yield "No data available."
+            return
+
+        str_rows = [[str(c) for c in row] for row in rows]
+        separator, row_fmt = self._table_layout(headers, str_rows)
+        header_line = row_fmt.format(*headers)
+
+        # Every line is as wide as the separator; 4 lines go to header and borders
+        rows_per_page = max(1, page_length // (len(separator) + 1) - 4)
+        for i in range(0, len(str_rows), rows_per_page):
+            body = [row_fmt.format(*row) for row in str_rows[i:i + rows_per_page]]
+            yield "\n".join([separator, header_line, separator, *body, separator])
+
+    def _table_layout(self, headers: list, str_rows: list) -> Tuple[str, str]:
+        """Returns the separator line and row format string for the given cells."""
+        # Calculate column widths
+        col_widths = [max(len(h), max(map(len, col))) for h, col in zip(headers, zip(*str_rows))]
+
+        # Build separator and a single row template
+        separator = "+" + "+".join(["-" * (w + 2) for w in col_widths]) + "+"
+        row_fmt = "| " + " | ".join(f"{{:<{w}}}" for w in col_widths) + " |"
+        return separator, row_fmt
 
     # --------------------------------------------------------------------------
     # Helper: Integration
     # --------------------------------------------------------------------------
     async def _get_current_level(self, member: discord.Member) -> int:
-        """Safely fetch level from VertyCo's LevelUp cog."""
+        """Safely fetch level from VertyCo's LevelUp cog, cached for a short TTL."""
+        key = (member.guild.id, member.id)
+        cached = self._level_cache.get(key)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+
         cog = self.bot.get_cog("LevelUp")
         if not cog:
             return 0
@@ -124,17 +210,175 @@ class LevelUpTracker(commands.Cog):
             # Helper to handle both async and sync returns from 3rd party cogs
             val = cog.get_level(member)
             if inspect.isawaitable(val):
-                return await val
-            return val
+                val = await val
         except AttributeError:
             try:
-                return await cog.config.member(member).level()
+                val = await cog.config.member(member).level()
             except Exception:
                 return 0
         except Exception as e:
             log.error(f"Failed to fetch level for {member}: {e}")
             return 0
 
+        self._level_cache[key] = (val, time.monotonic() + LEVEL_CACHE_TTL)
+        self._level_cache.move_to_end(key)
+        if len(self._level_cache) > LEVEL_CACHE_MAX_SIZE:
+            self._level_cache.popitem(last=False)
+        return val
+
+    @staticmethod
+    def _joined_ts(member: discord.Member) -> Optional[float]:
+        """Epoch of member.joined_at, treating naive datetimes as UTC."""
+        joined_at = member.joined_at
+        if not joined_at:
+            return None
+        if joined_at.tzinfo is None:
+            joined_at = joined_at.replace(tzinfo=timezone.utc)
+        return joined_at.timestamp()
+
+    def _join_timestamp(self, guild: discord.Guild, user_id: int, data: dict) -> Optional[float]:
+        """Stored join timestamp, falling back to Discord's joined_at for the member."""
+        join_ts = data.get("join_timestamp")
+        if join_ts:
+            return join_ts
+        member = guild.get_member(user_id)
+        return self._joined_ts(member) if member else None
+
+    async def _iter_member_data(
+        self, guild: discord.Guild, chunk_size: int = 100, *, members: Optional[List[discord.Member]] = None
+    ) -> AsyncIterator[Tuple[int, dict]]:
+        """
+        Yield (user_id, data) for current non-bot members, reading records in
+        concurrent chunks so only one chunk is held in memory at a time.
+        Pass `members` to reuse an already bot-filtered member list.
+        """
+        if members is None:
+            members = [m for m in guild.members if not m.bot]
+        for i in range(0, len(members), chunk_size):
+            chunk = members[i:i + chunk_size]
+            records = await asyncio.gather(*(self.config.member(m).all() for m in chunk))
+            for member, data in zip(chunk, records):
+                yield member.id, data
+
+    async def _get_all_levels(self, guild: discord.Guild) -> Optional[dict]:
+        """
+        Fetch every member's level from LevelUp in one call.
+        Returns {member_id: level}, or None if LevelUp offers no trustworthy
+        bulk source, in which case callers fall back to per-member lookups.
+        """
+        cog = self.bot.get_cog("LevelUp")
+        if not cog:
+            return None
+        try:
+            if hasattr(cog, "get_all_levels"):
+                val = cog.get_all_levels(guild)
+                if inspect.isawaitable(val):
+                    val = await val
+                levels = {int(uid): lvl for uid, lvl in val.items()}
+            elif hasattr(cog, "get_level"):
+                # Same precedence as _get_current_level: when get_level exists, member
+                # Config is not where LevelUp keeps levels, so it can't be bulk-read
+                return None
+            else:
+                data = await cog.config.all_members(guild)
+                levels = {uid: d["level"] for uid, d in data.items() if "level" in d}
+        except Exception as e:
+            log.debug(f"Bulk level fetch unavailable for {guild.name}: {e}")
+            return None
+        # An empty result is indistinguishable from "no data here"; never treat it
+        # as "everyone is level 0"
+        return levels or None
+
+    # --------------------------------------------------------------------------
+    # Helper: Redis Cache
+    # --------------------------------------------------------------------------
+    async def _connect_redis(self):
+        """Connect to the optional Redis cache if a URL is configured."""
+        self._batch_size = await self.config.redis_batch_size()
+        self._flush_interval = await self.config.redis_flush_interval()
+        url = await self.config.redis_url()
+        if not url:
+            return
+        if aioredis is None:
+            log.warning("A Redis URL is configured but the `redis` package is not installed.")
+            return
+        try:
+            client = aioredis.from_url(url, decode_responses=True)
+            await client.ping()
+        except Exception as e:
+            log.error(f"Failed to connect to Redis cache: {e}")
+            return
+        self.redis = client
+
+    @staticmethod
+    def _redis_key(guild_id: int, user_id: int) -> str:
+        return f"lut:{guild_id}:{user_id}"
+
+    async def _close_redis(self):
+        """Flush any queued updates, then close the Redis connection."""
+        await self._flush_pending()
+        if self.redis is not None:
+            await self.redis.close()
+            self.redis = None
+
+    def _cache_member(self, member: discord.Member, level: int, join_ts: Optional[float]):
+        """Queue a member's latest level and join timestamp for the next Redis flush."""
+        if self.redis is None:
+            return
+        mapping = {"lvl": level}
+        if join_ts:
+            mapping["join"] = join_ts
+        self._pending.append((member.guild.id, member.id, mapping))
+        if len(self._pending) >= self._batch_size:
+            self._flush_event.set()
+
+    async def _flush_pending(self):
+        """Write all queued cache updates in a single pipelined round trip."""
+        if self.redis is None or not self._pending:
+            return
+        drained, self._pending = self._pending, []
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for guild_id, user_id, mapping in drained:
+                    key = self._redis_key(guild_id, user_id)
+                    pipe.hset(key, mapping=mapping)
+                    # Entries for members we stop hearing about age out rather than
+                    # serving a stale level forever
+                    pipe.expire(key, REDIS_KEY_TTL)
+                await pipe.execute()
+        except Exception as e:
+            # Put the batch back ahead of anything queued since, so the next flush
+            # retries it and newer updates still land last
+            self._pending = drained + self._pending
+            log.error(f"Failed to flush {len(drained)} updates to Redis cache, will retry: {e}")
+
+    async def _flush_loop(self):
+        """Background writer that batches Redis updates by size or interval."""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), timeout=self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
+            await self._flush_pending()
+
+    async def _get_cached_levels(self, guild: discord.Guild, members: List[discord.Member]) -> dict:
+        """
+        Fetch cached levels for many members in a single pipelined round trip.
+        Returns {member_id: level} for cache hits only.
+        """
+        if self.redis is None or not members:
+            return {}
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for member in members:
+                    pipe.hget(self._redis_key(guild.id, member.id), "lvl")
+                values = await pipe.execute()
+        except Exception as e:
+            log.error(f"Failed to read Redis cache for guild {guild.id}: {e}")
+            return {}
+        return {m.id: int(v) for m, v in zip(members, values) if v is not None}
+
     # --------------------------------------------------------------------------
     # Events & Initialization
     # --------------------------------------------------------------------------
@@ -143,46 +387,65 @@ class LevelUpTracker(commands.Cog):
         """Run initialization logic when bot connects."""
         await self.bot.wait_until_red_ready()
         for guild in self.bot.guilds:
-            if not await self.config.guild(guild).initialized():
-                await self._initialize_guild(guild)
+            await self._initialize_guild(guild)
+
+    async def _initialize_guild(self, guild: discord.Guild, force: bool = False):
+        """
+        Snapshot current state for all untracked members.
+        Skips guilds that are already initialized unless `force` is set.
+        """
+        # Reconnects can fire on_connect repeatedly; never initialize a guild twice at once
+        lock = self._init_locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            if not force and await self.config.guild(guild).initialized():
+                return
+            await self._snapshot_members(guild)
+            await self.config.guild(guild).initialized.set(True)
 
-    async def _initialize_guild(self, guild: discord.Guild):
-        """Snapshot current state for all members."""
+    async def _snapshot_members(self, guild: discord.Guild):
+        """Record join time and starting level for members with no tracking data."""
         log.info(f"Initializing LevelUpTracker for guild: {guild.name}")
-        
-        for member in guild.members:
-            if member.bot:
-                continue
-            
-            # Set Join Date
-            join_ts = member.joined_at.timestamp() if member.joined_at else datetime.now(timezone.utc).timestamp()
-            
-            # Set Current Level (Snapshot)
-            current_level = await self._get_current_level(member)
+
+        tracked = await self.config.all_members(guild)
+        members = [m for m in guild.members if not m.bot and m.id not in tracked]
+        if not members:
+            return
+        all_levels = await self._get_all_levels(guild)
+        processed = 0
+
+        for i in range(0, len(members), 50):
+            chunk = members[i:i + 50]
+            # Snapshot current levels for the whole chunk
+            if all_levels is not None:
+                chunk_levels = [all_levels.get(m.id, 0) for m in chunk]
+            else:
+                chunk_levels = await asyncio.gather(*(self._get_current_level(m) for m in chunk))
             now_ts = datetime.now(timezone.utc).timestamp()
-            
-            member_conf = self.config.member(member)
-            await member_conf.join_timestamp.set(join_ts)
-            
-            # Record their starting point
-            await member_conf.initial_level.set(current_level)
-            
-            # If they are already leveled, snapshot that level as 'reached now'
-            if current_level > 0:
-                 await member_conf.levels.set_raw(str(current_level), value=now_ts)
-        
-        await self.config.guild(guild).initialized.set(True)
+
+            for member, current_level in zip(chunk, chunk_levels):
+                # Set Join Date
+                join_ts = member.joined_at.timestamp() if member.joined_at else now_ts
+
+                # One read-modify-write per member instead of one write per field
+                async with self.config.member(member).all() as data:
+                    data["join_timestamp"] = join_ts
+                    # Record their starting point
+                    data["initial_level"] = current_level
+                    # If they are already leveled, snapshot that level as 'reached now'
+                    if current_level > 0:
+                        data["levels"][str(current_level)] = now_ts
+
+                processed += 1
+                if processed % 100 == 0:
+                    await asyncio.sleep(0)
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
         if member.bot:
             return
-        ts = datetime.now(timezone.utc).timestamp()
-        
-        member_conf = self.config.member(member)
-        await member_conf.join_timestamp.set(ts)
-        # New members always start at 0
-        await member_conf.initial_level.set(0)
+        # New members always start at 0.
+        # Join time is read from member.joined_at on demand, so it is not stored here.
+        await self.config.member(member).initial_level.set(0)
 
     @commands.Cog.listener()
     async def on_member_remove(self, member: discord.Member):
@@ -192,7 +455,13 @@ class LevelUpTracker(commands.Cog):
         """
         if member.bot:
             return
+        self._level_cache.pop((member.guild.id, member.id), None)
         await self.config.member(member).clear()
+        if self.redis is not None:
+            try:
+                await self.redis.delete(self._redis_key(member.guild.id, member.id))
+            except Exception as e:
+                log.error(f"Failed to remove Redis cache entry for {member}: {e}")
 
     @commands.Cog.listener()
     async def on_member_levelup(
@@ -205,55 +474,141 @@ class LevelUpTracker(commands.Cog):
     ):
         if member.bot:
             return
-            
+
+        self._level_cache.pop((guild.id, member.id), None)
         now_ts = datetime.now(timezone.utc).timestamp()
         
-        # Ensure we have an initial level set if this is the first interaction
-        if await self.config.member(member).initial_level() is None:
-            # If we missed the join/init, assume previous level was the start
-            await self.config.member(member).initial_level.set(max(0, new_level - 1))
+        # Single read-modify-write for the whole event
+        async with self.config.member(member).all() as data:
+            # Ensure we have an initial level set if this is the first interaction
+            if data.get("initial_level") is None:
+                # If we missed the join/init, assume previous level was the start
+                data["initial_level"] = max(0, new_level - 1)
+            data.setdefault("levels", {})[str(new_level)] = now_ts
+            join_ts = data.get("join_timestamp")
 
-        await self.config.member(member).levels.set_raw(str(new_level), value=now_ts)
+        if self.redis is not None:
+            if not join_ts and member.joined_at:
+                join_ts = member.joined_at.timestamp()
+            self._cache_member(member, new_level, join_ts)
 
     # --------------------------------------------------------------------------
     # Audit Helpers
     # --------------------------------------------------------------------------
-    async def _get_stagnant_members(self, guild: discord.Guild, min_days: int, max_level: int) -> List[Tuple[discord.Member, int, int]]:
+    async def _get_stagnant_members(
+        self, guild: discord.Guild, min_days: int, max_level: int, *, members: Optional[List[discord.Member]] = None
+    ) -> List[Tuple[discord.Member, int, int]]:
         """
         Identify members who meet the criteria:
         - On server for >= min_days
         - Current level <= max_level
         """
-        results = []
-        now = datetime.now(timezone.utc)
-        
+        return [entry async for entry in self._iter_stagnant_members(guild, min_days, max_level, members=members)]
+
+    async def _iter_stagnant_members(
+        self, guild: discord.Guild, min_days: int, max_level: int, *, members: Optional[List[discord.Member]] = None
+    ) -> AsyncIterator[Tuple[discord.Member, int, int]]:
+        """
+        Yield (member, days_on_server, level) for stagnant members as they are found.
+        See `_get_stagnant_members` for the criteria.
+        Pass `members` to reuse an already bot-filtered member list.
+        """
+        if members is None:
+            members = [m for m in guild.members if not m.bot]
+        now_ts = datetime.now(timezone.utc).timestamp()
+        cutoff_ts = now_ts - min_days * 86400
+
+        # Milestone roles let us prune high-level members without awaiting LevelUp
+        level_roles = {int(k): v for k, v in (await self.config.guild(guild).level_roles()).items()}
+
+        # First pass: cheap synchronous filters, no awaits.
         # We need to iterate all members. This can be heavy on large servers.
         # We use guild.members which should be cached if Intents are enabled.
-        for member in guild.members:
-            if member.bot:
-                continue
-            
-            if not member.joined_at:
-                continue
-                
-            # Calculate days on server
-            # Ensure joined_at is aware
-            joined_at = member.joined_at
-            if joined_at.tzinfo is None:
-                joined_at = joined_at.replace(tzinfo=timezone.utc)
-            
-            diff = now - joined_at
-            days_on_server = diff.days
-            
-            if days_on_server < min_days:
-                continue
-            
-            # Check level
-            level = await self._get_current_level(member)
-            if level <= max_level:
-                results.append((member, days_on_server, level))
-        
-        return results
+        # Join age is the cheapest filter, so it runs first and shrinks the set for the rest.
+        candidates = [
+            (m, now_ts - jts)
+            for m in members
+            if (jts := self._joined_ts(m)) is not None and jts <= cutoff_ts
+        ]
+
+        if level_roles:
+            candidates = [
+                (m, age) for m, age in candidates
+                if max((level_roles[r.id] for r in m.roles if r.id in level_roles), default=0) <= max_level
+            ]
+
+        # Longest-serving first, so streamed results come out in global days-descending order
+        candidates.sort(key=lambda c: c[1], reverse=True)
+
+        # A single bulk read from LevelUp replaces per-member lookups when supported,
+        # otherwise one pipelined Redis read covers every candidate if enabled
+        all_levels = await self._get_all_levels(guild)
+        if all_levels is not None:
+            cached_levels = {m.id: all_levels.get(m.id, 0) for m, _ in candidates}
+        else:
+            cached_levels = await self._get_cached_levels(guild, [m for m, _ in candidates])
+
+        # Second pass: fetch remaining levels concurrently in bounded chunks
+        for i in range(0, len(candidates), 100):
+            chunk = candidates[i:i + 100]
+            missing = [m for m, _ in chunk if m.id not in cached_levels]
+            fetched = await asyncio.gather(*(self._get_current_level(m) for m in missing))
+            fetched_levels = {m.id: lvl for m, lvl in zip(missing, fetched)}
+
+            for member, age in chunk:
+                level = cached_levels.get(member.id)
+                if level is None:
+                    level = fetched_levels[member.id]
+                if level <= max_level:
+                    # Only matches need the day count for output
+                    days_on_server = int(age // 86400)
+                    yield member, days_on_server, level
+
+    async def _confirm_stagnant(
+        self, stagnant: List[Tuple[discord.Member, int, int]], max_level: int
+    ) -> List[discord.Member]:
+        """
+        Re-check matched members against LevelUp directly before acting on them,
+        since bulk and Redis-cached levels can lag behind (e.g. level-ups missed
+        while this cog was unloaded).
+        """
+        confirmed = []
+        for i in range(0, len(stagnant), 100):
+            chunk = [m for m, _, _ in stagnant[i:i + 100]]
+            levels = await asyncio.gather(*(self._get_current_level(m) for m in chunk))
+            confirmed.extend(m for m, lvl in zip(chunk, levels) if lvl <= max_level)
+        return confirmed
+
+    async def _warn_in_batches(
+        self,
+        api,
+        guild: discord.Guild,
+        members: List[discord.Member],
+        author: discord.Member,
+        level: int,
+        reason: str,
+        batch_size: int = 50,
+    ) -> list:
+        """
+        Send members to WarnSystem in small batches, pausing between them
+        so large audits cooperate with Discord's rate limits.
+        Returns the combined list of members WarnSystem failed to act on.
+        """
+        failed_all = []
+        for i in range(0, len(members), batch_size):
+            if i:
+                await asyncio.sleep(1.0)
+            # The warn function accepts an iterable of members
+            failed = await api.warn(
+                guild=guild,
+                members=members[i:i + batch_size],
+                author=author,
+                level=level,
+                reason=reason
+            )
+            if failed:
+                failed_all.extend(failed)
+        return failed_all
 
     # --------------------------------------------------------------------------
     # Admin Commands
@@ -271,22 +626,92 @@ class LevelUpTracker(commands.Cog):
         is_init = await self.config.guild(ctx.guild).initialized()
         vertyco_loaded = self.bot.get_cog("LevelUp") is not None
         warnsystem_loaded = self.bot.get_cog("WarnSystem") is not None
+        redis_connected = self.redis is not None
+        level_roles = await self.config.guild(ctx.guild).level_roles()
+        redis_batch = f"{self._batch_size} / {self._flush_interval}s"
         
         headers = ["Setting", "Value"]
         rows = [
             ["Initialized", str(is_init)],
             ["VertyCo LevelUp Loaded", str(vertyco_loaded)],
-            ["WarnSystem Loaded", str(warnsystem_loaded)]
+            ["WarnSystem Loaded", str(warnsystem_loaded)],
+            ["Redis Cache Connected", str(redis_connected)],
+            ["Redis Batch / Interval", redis_batch],
+            ["Level Roles Mapped", str(len(level_roles))]
         ]
         
         table = self._make_table(headers, rows)
         await ctx.send(box(table, lang="prolog"))
 
+    @leveluptrackerset.command(name="redis")
+    @checks.is_owner()
+    async def leveluptrackerset_redis(self, ctx, url: Optional[str] = None):
+        """
+        Set or clear the optional Redis cache URL.
+
+        Example: `[p]leveluptrackerset redis redis://localhost:6379/0`
+        Run without a URL to disable the cache and fall back to Config.
+        """
+        if url and aioredis is None:
+            return await ctx.send("The `redis` package is not installed. Install it with `[p]pipinstall redis`.")
+
+        await self.config.redis_url.set(url)
+        if self.redis is not None:
+            await self._close_redis()
+
+        if not url:
+            return await ctx.send("Redis cache disabled.")
+
+        await self._connect_redis()
+        if self.redis is None:
+            return await ctx.send("Could not connect to Redis. Check the URL and your logs.")
+        await ctx.send("Redis cache connected. Levels will be mirrored as members level up.")
+
+    @leveluptrackerset.command(name="redisbatch")
+    @checks.is_owner()
+    async def leveluptrackerset_redisbatch(self, ctx, batch_size: int, flush_interval: float):
+        """
+        Tune how Redis cache updates are batched.
+
+        Updates are written in one pipeline every `flush_interval` seconds,
+        or sooner once `batch_size` updates are queued.
+
+        Example: `[p]leveluptrackerset redisbatch 100 1.0`
+        """
+        if batch_size < 1 or flush_interval <= 0:
+            return await ctx.send("Batch size must be at least 1 and the interval must be greater than 0.")
+
+        await self.config.redis_batch_size.set(batch_size)
+        await self.config.redis_flush_interval.set(flush_interval)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        await ctx.send(f"Redis updates will flush every {flush_interval}s or every {batch_size} updates.")
+
+    @leveluptrackerset.command(name="levelrole")
+    async def leveluptrackerset_levelrole(self, ctx, role: discord.Role, level: Optional[int] = None):
+        """
+        Map a LevelUp milestone role to the level it is granted at.
+
+        Audits skip members holding a mapped role above the requested max level
+        without querying LevelUp. Run without a level to remove the mapping.
+
+        Example: `[p]leveluptrackerset levelrole @Level10 10`
+        """
+        async with self.config.guild(ctx.guild).level_roles() as level_roles:
+            if level is None:
+                if level_roles.pop(str(role.id), None) is None:
+                    return await ctx.send(f"{role.name} is not mapped to a level.")
+                return await ctx.send(f"Removed level mapping for {role.name}.")
+            if level < 0:
+                return await ctx.send("Level must be 0 or higher.")
+            level_roles[str(role.id)] = level
+        await ctx.send(f"{role.name} now marks members as at least Level {level}.")
+
     @leveluptrackerset.command(name="reindex")
     async def leveluptrackerset_reindex(self, ctx):
-        """Manually trigger the initialization check."""
+        """Manually trigger the initialization check for untracked members."""
         await ctx.send("Starting manual re-index of members...")
-        await self._initialize_guild(ctx.guild)
+        await self._initialize_guild(ctx.guild, force=True)
         await ctx.send("Re-index complete.")
 
     @leveluptrackerset.command(name="cleanup")
@@ -330,28 +755,36 @@ class LevelUpTracker(commands.Cog):
         Example: `[p]leveluptrackerset audit list 30 0`
         Lists users here for 30+ days who are still level 0.
         """
-        async with ctx.typing():
-            stagnant = await self._get_stagnant_members(ctx.guild, min_days, max_level)
-            
-            if not stagnant:
-                return await ctx.send(f"No users found who have been here for {min_days}+ days at level {max_level} or lower.")
-            
-            # Sort by days descending
-            stagnant.sort(key=lambda x: x[1], reverse=True)
-            
-            headers = ["Member", "ID", "Days", "Level"]
+        headers = ["Member", "ID", "Days", "Level"]
+        # 20 rows of max-width names stays under Discord's 2000 character limit
+        batch_size = 20
+        batch = []
+        found = 0
+
+        async def send_batch():
+            # Entries already arrive sorted by days descending
             rows = []
-            for m, days, lvl in stagnant:
+            for m, days, lvl in batch:
                 # Sanitize display name for table
                 safe_name = self._sanitize_name(m.display_name)
                 rows.append([safe_name, str(m.id), str(days), str(lvl)])
+            await ctx.send(box(self._make_table(headers, rows), lang="prolog"))
+            batch.clear()
+
+        async with ctx.typing():
+            members = [m for m in ctx.guild.members if not m.bot]
+            async for entry in self._iter_stagnant_members(ctx.guild, min_days, max_level, members=members):
+                batch.append(entry)
+                found += 1
+                if len(batch) >= batch_size:
+                    await send_batch()
+            if batch:
+                await send_batch()
             
-            table = self._make_table(headers, rows)
-            
-            msg = f"**Audit List**\nCriteria: {min_days}+ days on server, Level {max_level} or lower.\nFound {len(stagnant)} users."
+            if not found:
+                return await ctx.send(f"No users found who have been here for {min_days}+ days at level {max_level} or lower.")
             
-            for page in pagify(table, page_length=1900):
-                await ctx.send(box(page, lang="prolog"))
+            msg = f"**Audit List**\nCriteria: {min_days}+ days on server, Level {max_level} or lower.\nFound {found} users."
             await ctx.send(msg)
 
     @leveluptrackerset_audit.command(name="warn")
@@ -374,27 +807,23 @@ class LevelUpTracker(commands.Cog):
         if not 1 <= warn_level <= 5:
             return await ctx.send("Warn level must be between 1 and 5.")
 
-        stagnant = await self._get_stagnant_members(ctx.guild, min_days, max_level)
+        members = [m for m in ctx.guild.members if not m.bot]
+        stagnant = await self._get_stagnant_members(ctx.guild, min_days, max_level, members=members)
         
         if not stagnant:
             return await ctx.send("No users found matching criteria.")
 
-        members_to_warn = [x[0] for x in stagnant]
+        members_to_warn = await self._confirm_stagnant(stagnant, max_level)
+        if not members_to_warn:
+            return await ctx.send("No users found matching criteria.")
         count = len(members_to_warn)
         
         await ctx.send(f"Found {count} users matching criteria. Starting warnings... This may take a moment.")
         
         try:
             # warn_cog.api is the standard entry point for Laggron's WarnSystem
-            api = warn_cog.api
-            
-            # The warn function accepts an iterable of members
-            failed = await api.warn(
-                guild=ctx.guild,
-                members=members_to_warn,
-                author=ctx.author,
-                level=warn_level,
-                reason=reason
+            failed = await self._warn_in_batches(
+                warn_cog.api, ctx.guild, members_to_warn, ctx.author, warn_level, reason
             )
             
             msg = f"Successfully processed warnings for {count} users."
@@ -418,26 +847,23 @@ class LevelUpTracker(commands.Cog):
         if not warn_cog:
             return await ctx.send("The `WarnSystem` cog is not loaded. I cannot kick users via WarnSystem without it.")
 
-        stagnant = await self._get_stagnant_members(ctx.guild, min_days, max_level)
+        members = [m for m in ctx.guild.members if not m.bot]
+        stagnant = await self._get_stagnant_members(ctx.guild, min_days, max_level, members=members)
         
         if not stagnant:
             return await ctx.send("No users found matching criteria.")
             
-        members_to_kick = [x[0] for x in stagnant]
+        members_to_kick = await self._confirm_stagnant(stagnant, max_level)
+        if not members_to_kick:
+            return await ctx.send("No users found matching criteria.")
         count = len(members_to_kick)
         
         await ctx.send(f"Found {count} users matching criteria. **Starting kick process via WarnSystem...**")
         
         try:
-            api = warn_cog.api
-            
             # Level 3 in WarnSystem corresponds to a Kick
-            failed = await api.warn(
-                guild=ctx.guild,
-                members=members_to_kick,
-                author=ctx.author,
-                level=3, 
-                reason=reason
+            failed = await self._warn_in_batches(
+                warn_cog.api, ctx.guild, members_to_kick, ctx.author, 3, reason
             )
             
             msg = f"Successfully processed kicks for {count} users."
@@ -490,18 +916,24 @@ class LevelUpTracker(commands.Cog):
         headers = ["Level", "Date Reached", "Time from Start", "Time from Prev"]
         rows = []
         
-        join_dt = datetime.fromtimestamp(join_ts, timezone.utc)
         prev_ts = join_ts
+        start_ts = join_ts
         if initial_level > 0:
+            start_ts = levels.get(str(initial_level), join_ts)
             if str(initial_level) in levels:
                 prev_ts = levels[str(initial_level)]
 
+        # Many levels share a day; format each day only once
+        date_cache = {}
+
         for lvl, ts in sorted_levels:
             if lvl < initial_level:
                 continue
                 
-            current_dt = datetime.fromtimestamp(ts, timezone.utc)
-            date_str = current_dt.strftime("%Y-%m-%d")
+            day_key = int(ts // 86400)
+            date_str = date_cache.get(day_key)
+            if date_str is None:
+                date_str = date_cache[day_key] = datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d")
 
             # 1. Time from Start
             if lvl == initial_level:
@@ -509,17 +941,13 @@ class LevelUpTracker(commands.Cog):
                 prev_ts = ts
                 continue
 
-            if initial_level == 0:
-                total_delta = current_dt - join_dt
-                total_str = self._short_timedelta(total_delta)
-            else:
-                start_ts = levels.get(str(initial_level), join_ts)
-                total_delta = current_dt - datetime.fromtimestamp(start_ts, timezone.utc)
-                total_str = self._short_timedelta(total_delta) + "^"
+            # Durations are plain epoch differences, no datetime arithmetic
+            total_str = _short_timedelta_cached(int(ts - start_ts))
+            if initial_level > 0:
+                total_str += "^"
 
             # 2. Time from Previous
-            step_delta = current_dt - datetime.fromtimestamp(prev_ts, timezone.utc)
-            step_str = self._short_timedelta(step_delta)
+            step_str = _short_timedelta_cached(int(ts - prev_ts))
 
             rows.append([f"Level {lvl}", date_str, total_str, step_str])
             prev_ts = ts 
@@ -540,8 +968,9 @@ class LevelUpTracker(commands.Cog):
         If a level is provided (e.g. `[p]levelaverages 5`), lists the times 
         for all users who reached that specific level.
         """
-        all_members = await self.config.all_members(ctx.guild)
-        
+        # Filter bots once and share the list with every helper below
+        members = [m for m in ctx.guild.members if not m.bot]
+
         if level is not None:
             # ------------------------------------------------------------------
             # DETAILED VIEW FOR SPECIFIC LEVEL
@@ -550,26 +979,22 @@ class LevelUpTracker(commands.Cog):
                  return await ctx.send("Please provide a level greater than 0.")
                  
             entries = [] # List of (user_id, time_seconds)
+            lvl_str = str(level)
             
-            for user_id, data in all_members.items():
-                initial_level = data.get("initial_level")
-                
+            async for user_id, data in self._iter_member_data(ctx.guild, members=members):
                 # Strict Filter: New Users Only
-                if initial_level is not None and initial_level > 0:
+                if data.get("initial_level") or 0:
                     continue
                 
-                join_ts = data.get("join_timestamp")
-                levels = data.get("levels", {})
+                join_ts = self._join_timestamp(ctx.guild, user_id, data)
+                reached_ts = data.get("levels", {}).get(lvl_str)
                 
-                if not join_ts:
+                if not join_ts or reached_ts is None:
                     continue
                     
-                lvl_str = str(level)
-                if lvl_str in levels:
-                    reached_ts = levels[lvl_str]
-                    delta = reached_ts - join_ts
-                    if delta > 0:
-                        entries.append((user_id, delta))
+                delta = reached_ts - join_ts
+                if delta > 0:
+                    entries.append((user_id, delta))
             
             if not entries:
                 return await ctx.send(f"No new users have reached **Level {level}** yet.")
@@ -579,24 +1004,27 @@ class LevelUpTracker(commands.Cog):
             
             headers = ["Rank", "Member", "Time"]
             rows = []
+
+            # Resolve members once and bind hot helpers locally for the loop
+            members_by_id = {m.id: m for m in members}
+            sanitize = self._sanitize_name
+            short = self._short_timedelta
             
             for i, (user_id, time_seconds) in enumerate(entries, 1):
-                member = ctx.guild.get_member(user_id)
+                member = members_by_id.get(user_id)
                 if member:
-                    name = self._sanitize_name(member.display_name)
+                    name = sanitize(member.display_name)
                     if not name:
                          name = str(member.id)
                 else:
                     name = f"<{user_id}>"
                 
-                time_str = self._short_timedelta(timedelta(seconds=time_seconds))
+                time_str = short(timedelta(seconds=time_seconds))
                 rows.append([f"#{i}", name, time_str])
                 
-            table = self._make_table(headers, rows)
-            
             heading = f"**Level {level} Records (New Users Only)**\nTotal Records: {len(entries)}"
             
-            for page in pagify(table, page_length=1900):
+            for page in self._make_paged_tables(headers, rows):
                 await ctx.send(f"{heading}\n" + box(page, lang="prolog"))
                 heading = "" # Only show heading on first page
             
@@ -605,13 +1033,13 @@ class LevelUpTracker(commands.Cog):
         # ----------------------------------------------------------------------
         # SUMMARY VIEW (AGGREGATES)
         # ----------------------------------------------------------------------
-        level_times = {} 
+        level_times = defaultdict(list)
         
         skipped_legacy = 0
         included_users = 0
 
-        for user_id, data in all_members.items():
-            join_ts = data.get("join_timestamp")
+        async for user_id, data in self._iter_member_data(ctx.guild, members=members):
+            join_ts = self._join_timestamp(ctx.guild, user_id, data)
             levels = data.get("levels", {})
             initial_level = data.get("initial_level")
 
@@ -626,13 +1054,9 @@ class LevelUpTracker(commands.Cog):
             included_users += 1
                 
             for lvl_str, reached_ts in levels.items():
-                lvl = int(lvl_str)
                 time_to_reach = reached_ts - join_ts
-                
                 if time_to_reach > 0:
-                    if lvl not in level_times:
-                        level_times[lvl] = []
-                    level_times[lvl].append(time_to_reach)
+                    level_times[int(lvl_str)].append(time_to_reach)
 
         if not level_times:
             msg = "Not enough data from **New Users** to calculate averages yet."
@@ -646,20 +1070,17 @@ class LevelUpTracker(commands.Cog):
 
         for lvl in sorted(level_times.keys()):
             times = level_times[lvl]
+            mean_seconds, median_seconds = self._level_stats(times)
             
-            # Mean
-            mean_seconds = statistics.mean(times)
             mean_str = self._short_timedelta(timedelta(seconds=mean_seconds))
-            
-            # Median
-            median_seconds = statistics.median(times)
             median_str = self._short_timedelta(timedelta(seconds=median_seconds))
             
             # Mode removed
             
             rows.append([lvl, mean_str, median_str, len(times)])
 
-        table = self._make_table(headers, rows)
-        
         # Updated Title Wording
-        await ctx.send(f"**LevelUp Averages (From 2026-01-01)**\nBased on {included_users} new members.\n\n" + box(table, lang="prolog"))
\ No newline at end of file
+        heading = f"**LevelUp Averages (From 2026-01-01)**\nBased on {included_users} new members.\n\n"
+        for page in self._make_paged_tables(headers, rows):
+            await ctx.send(heading + box(page, lang="prolog"))
+            heading = "" # Only show heading on first page
\ No newline at end of file
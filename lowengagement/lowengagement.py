@@ -1,9 +1,12 @@
 import discord
+import asyncio
 import re
-import datetime
+import time
 import logging
 import inspect
-from typing import Optional, Union, List
+import functools
+import emoji
+from typing import Optional, Union, List, Dict, Set, Tuple
 
 from redbot.core import commands, Config, checks
 from redbot.core.bot import Red
@@ -11,6 +14,53 @@ from redbot.core.utils.chat_formatting import box, humanize_timedelta
 
 log = logging.getLogger("red.NoiselessVolatileLobster.lowengagement")
 
+STREAK_FLUSH_INTERVAL = 60  # Seconds between write-behind flushes of streak state
+LEVEL_CACHE_TTL = 60        # Seconds a fetched LevelUp level stays fresh
+
+# Regex to match custom emojis <a:name:id> or <:name:id>, compiled once per process
+CUSTOM_EMOJI_RE = re.compile(r'<a?:\w+:\d+>')
+
+ASCII_ALNUM = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789")
+
+EMOJI_CACHE_MAX_LEN = 256  # Longer messages are not memoized
+
+# Every code point that appears in any emoji sequence, plus Unicode whitespace.
+# A message containing anything outside this set cannot be emoji-only.
+EMOJI_OR_SPACE_CHARS = frozenset(
+    ch for sequence in emoji.EMOJI_DATA for ch in sequence
+) | frozenset(chr(cp) for cp in range(0x3001) if chr(cp).isspace())
+
+
+def _is_emoji_only(content: str) -> bool:
+    # 1. Remove Custom Emojis (they always start with '<')
+    temp = CUSTOM_EMOJI_RE.sub('', content) if '<' in content else content
+
+    # No emoji is pure ASCII, so ASCII-only text is emoji-only just when it is blank.
+    # str.isascii() is a constant-time flag check on CPython strings.
+    if temp.isascii():
+        return not temp.strip()
+
+    # Fast reject: any ASCII letter or digit left means this is ordinary text,
+    # so skip the Unicode emoji lookup entirely (set test, no new string)
+    if not ASCII_ALNUM.isdisjoint(temp):
+        return False
+
+    # Fast reject: a single C-level set scan finds any character that is
+    # neither whitespace nor part of an emoji, before tokenizing
+    if not EMOJI_OR_SPACE_CHARS.issuperset(temp):
+        return False
+
+    # 2. Every remaining token must be a Unicode emoji (including ZWJ sequences,
+    # skin tones and flags) or whitespace
+    return all(
+        isinstance(token.value, emoji.EmojiMatch) or token.chars.isspace()
+        for token in emoji.analyze(temp, non_emoji=True)
+    )
+
+
+_is_emoji_only_cached = functools.lru_cache(maxsize=4096)(_is_emoji_only)
+
+
 class LowEngagement(commands.Cog):
     """
     Detect and warn users with low engagement (emoji-only spam).
@@ -41,20 +91,162 @@ class LowEngagement(commands.Cog):
         self.config.register_guild(**default_guild)
         self.config.register_member(**default_member)
 
-        # Regex to match custom emojis <a:name:id> or <:name:id>
-        self.custom_emoji_regex = re.compile(r'<a?:\w+:\d+>')
-
-        # Broad regex for unicode emojis/symbols
-        # This includes standard emoji ranges, dingbats, geometric shapes, etc.
-        self.unicode_emoji_regex = re.compile(
-            r'['
-            r'\U0001f000-\U0001faff'  # Supplemental Symbols and Pictographs
-            r'\U00002000-\U00002bff'  # General Punctuation/Symbols (inc. some math/arrows often used as emojis)
-            r'\U00002600-\U000027ff'  # Misc Symbols / Dingbats
-            r'\U0000fe00-\U0000fe0f'  # Variation Selectors
-            r'\U0001f900-\U0001f9ff'  # Supplemental Symbols and Pictographs
-            r']+', flags=re.UNICODE
-        )
+        # In-memory snapshot of guild settings so on_message avoids Config awaits
+        self._guild_cache: Dict[int, dict] = {}
+        # IDs of guilds with the cog enabled; None until the preload finishes
+        self._enabled_guilds: Optional[Set[int]] = None
+        self.bot.loop.create_task(self._preload())
+
+        # Hot streak state lives in RAM: (guild_id, user_id) -> (streak, last_emoji_ts).
+        # Changed entries are written back to Config periodically.
+        self._streaks: Dict[Tuple[int, int], Tuple[int, float]] = {}
+        self._dirty_streaks: Set[Tuple[int, int]] = set()
+        self._members_loaded = False
+        # guild_id -> IDs of members flagged after their first warning
+        self._flagged: Dict[int, Set[int]] = {}
+        self._flush_task = self.bot.loop.create_task(self._flush_loop())
+
+        # (guild_id, user_id) -> (level, expires_at)
+        self._level_cache: Dict[Tuple[int, int], Tuple[int, float]] = {}
+
+        # Integration cogs, kept current by the cog add/remove listeners
+        self._levelup = None
+        self._levelup_get_level = None
+        self._levelup_is_async = False
+        self._warnsystem = None
+        self._warn_fn = None
+        self._hibernate = None
+        for name in ("LevelUp", "WarnSystem", "Hibernate"):
+            self._bind_integration(name, self.bot.get_cog(name))
+
+    def cog_unload(self):
+        self._flush_task.cancel()
+        # Persist whatever is still pending
+        self.bot.loop.create_task(self._flush_streaks())
+
+    async def _preload(self):
+        """
+        Warm every in-memory cache at startup with one bulk read per scope,
+        instead of one lazy Config read per guild and member as traffic arrives.
+        """
+        await self._load_guild_cache()
+        await self._load_member_cache()
+
+    async def _load_member_cache(self):
+        """Preload streak state for every stored member in one read."""
+        all_members = await self.config.all_members()
+        for guild_id, members in all_members.items():
+            for user_id, data in members.items():
+                self._streaks.setdefault((guild_id, user_id), (data["streak"], data["last_emoji_ts"]))
+                if data["is_flagged"]:
+                    self._flagged.setdefault(guild_id, set()).add(user_id)
+        self._members_loaded = True
+
+    async def _load_guild_cache(self):
+        """Preload settings for every configured guild in one read."""
+        all_guilds = await self.config.all_guilds()
+        for guild_id, settings in all_guilds.items():
+            self._guild_cache.setdefault(guild_id, self._prepare_settings(settings))
+        # "enabled" defaults to False, so every enabled guild has stored settings
+        self._enabled_guilds = {gid for gid, settings in all_guilds.items() if settings["enabled"]}
+
+    async def _get_settings(self, guild: discord.Guild) -> dict:
+        """Return cached guild settings, loading them from Config on a miss."""
+        settings = self._guild_cache.get(guild.id)
+        if settings is None:
+            settings = self._prepare_settings(await self.config.guild(guild).all())
+            self._guild_cache[guild.id] = settings
+        return settings
+
+    @staticmethod
+    def _prepare_settings(settings: dict) -> dict:
+        """Convert ignore lists to frozensets for O(1) membership tests."""
+        return {
+            **settings,
+            "ignored_roles": frozenset(settings["ignored_roles"]),
+            "ignored_channels": frozenset(settings["ignored_channels"]),
+        }
+
+    @commands.Cog.listener()
+    async def on_cog_add(self, cog: commands.Cog):
+        self._bind_integration(cog.qualified_name, cog)
+
+    @commands.Cog.listener()
+    async def on_cog_remove(self, cog: commands.Cog):
+        self._bind_integration(cog.qualified_name, None)
+
+    def _bind_integration(self, name: str, cog: Optional[commands.Cog]):
+        """Update the cached reference for an integration cog."""
+        if name == "LevelUp":
+            self._levelup = cog
+            # Probe get_level once here rather than on every message
+            self._levelup_get_level = getattr(cog, "get_level", None)
+            self._levelup_is_async = asyncio.iscoroutinefunction(self._levelup_get_level)
+            self._level_cache.clear()
+        elif name == "WarnSystem":
+            self._warnsystem = cog
+            # Bound api.warn, resolved once instead of on every trigger
+            self._warn_fn = getattr(getattr(cog, "api", None), "warn", None)
+        elif name == "Hibernate":
+            self._hibernate = cog
+
+    async def _get_streak(self, member: discord.Member) -> Tuple[int, float]:
+        """Return (streak, last_emoji_ts) from memory, loading from Config on a miss."""
+        key = (member.guild.id, member.id)
+        state = self._streaks.get(key)
+        if state is None:
+            if self._members_loaded:
+                # Preload saw every stored member, so a miss means defaults
+                state = (0, 0.0)
+            else:
+                data = await self.config.member(member).all()
+                state = (data["streak"], data["last_emoji_ts"])
+            self._streaks[key] = state
+        return state
+
+    def _set_streak(self, member: discord.Member, streak: int, last_ts: float):
+        """Update streak state in memory and mark it for the next flush."""
+        key = (member.guild.id, member.id)
+        self._streaks[key] = (streak, last_ts)
+        self._dirty_streaks.add(key)
+
+    async def _flush_streaks(self):
+        """
+        Write all changed streak state back to Config.
+        Keys leave the dirty set only once their write succeeds, so a failed or
+        cancelled flush leaves the rest for the next one.
+        """
+        for key in list(self._dirty_streaks):
+            state = self._streaks.get(key)
+            if state is None:
+                self._dirty_streaks.discard(key)
+                continue
+            guild_id, user_id = key
+            # One read-modify-write per member keeps is_flagged intact
+            async with self.config.member_from_ids(guild_id, user_id).all() as data:
+                data["streak"], data["last_emoji_ts"] = state
+            # If the streak changed during the write, keep it dirty for next time
+            if self._streaks.get(key) is state:
+                self._dirty_streaks.discard(key)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(STREAK_FLUSH_INTERVAL)
+            try:
+                await self._flush_streaks()
+            except Exception as e:
+                log.error(f"Failed to flush streak state: {e}")
+
+    async def _set_ignored(self, guild: discord.Guild, key: str, ids: Set[int]):
+        """Persist an ignore list with one write and update the cached frozenset in place."""
+        await self.config.guild(guild).set_raw(key, value=list(ids))
+        settings = self._guild_cache.get(guild.id)
+        if settings is not None:
+            settings[key] = frozenset(ids)
+
+    def _invalidate(self, guild: discord.Guild):
+        """Drop cached settings after a setter so the next read reloads them."""
+        self._guild_cache.pop(guild.id, None)
 
     def is_emoji_only(self, content: str) -> bool:
         """
@@ -62,43 +254,40 @@ class LowEngagement(commands.Cog):
         """
         if not content:
             return False
-
-        # 1. Remove Custom Emojis
-        temp = self.custom_emoji_regex.sub('', content)
-
-        # 2. Remove Unicode Emojis (Broad sweep)
-        temp = self.unicode_emoji_regex.sub('', temp)
-
-        # 3. Strip whitespace
-        temp = temp.strip()
-
-        # 4. If nothing is left, it was all emojis/whitespace
-        return len(temp) == 0
+        # Short messages repeat a lot (reaction-style spam); longer ones skip the cache
+        if len(content) <= EMOJI_CACHE_MAX_LEN:
+            return _is_emoji_only_cached(content)
+        return _is_emoji_only(content)
 
     async def get_user_level(self, member: discord.Member) -> int:
         """Get LevelUp level for a member, defaulting to 0 if not found."""
-        levelup = self.bot.get_cog("LevelUp")
-        if not levelup:
+        get_level = self._levelup_get_level
+        if get_level is None:
             return 0
+
+        key = (member.guild.id, member.id)
+        cached = self._level_cache.get(key)
+        now = time.monotonic()
+        if cached is not None and cached[1] > now:
+            return cached[0]
+
+        lvl = 0
         try:
-            # Check if get_level exists and is callable
-            if hasattr(levelup, "get_level"):
-                # Potential return types depending on version: int, object with .level, or coroutine
-                response = levelup.get_level(member)
-                
-                # Check if it's awaitable (coroutine) and await it if so
-                if inspect.isawaitable(response):
-                    lvl = await response
-                else:
-                    lvl = response
-
-                if isinstance(lvl, int):
-                    return lvl
-                # Handle object return if needed (hypothetical, based on common patterns)
-                return getattr(lvl, "level", 0)
+            # Potential return types depending on version: int, object with .level, or coroutine
+            response = get_level(member)
+            
+            # Await only when get_level is async (or returns an awaitable anyway)
+            if self._levelup_is_async or inspect.isawaitable(response):
+                response = await response
+
+            # Handle object return if needed (hypothetical, based on common patterns)
+            lvl = response if isinstance(response, int) else getattr(response, "level", 0)
         except Exception as e:
             log.debug(f"Failed to get level for {member.id}: {e}")
-        return 0
+            return 0
+
+        self._level_cache[key] = (lvl, now + LEVEL_CACHE_TTL)
+        return lvl
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
@@ -106,11 +295,20 @@ class LowEngagement(commands.Cog):
             return
         if not message.guild:
             return
-        if not await self.config.guild(message.guild).enabled():
+        # Cheapest possible exit for guilds that never enabled the cog
+        if self._enabled_guilds is not None and message.guild.id not in self._enabled_guilds:
+            return
+        # Attachment/sticker/embed-only messages have no text to judge
+        content = message.content
+        if not content:
+            return
+
+        settings = await self._get_settings(message.guild)
+        if not settings["enabled"]:
             return
 
         # Hibernate Integration
-        hibernate = self.bot.get_cog("Hibernate")
+        hibernate = self._hibernate
         if hibernate:
             try:
                 is_hibernating = await hibernate.is_hibernating(message.author)
@@ -119,90 +317,86 @@ class LowEngagement(commands.Cog):
             except Exception:
                 pass # Hibernate method might differ or fail, safe ignore
 
-        # Ignore if user has ignored role
-        ignored_roles = await self.config.guild(message.guild).ignored_roles()
-        if any(r.id in ignored_roles for r in message.author.roles):
+        # Ignore if channel is ignored
+        if message.channel.id in settings["ignored_channels"]:
             return
 
-        # Ignore if channel is ignored
-        ignored_channels = await self.config.guild(message.guild).ignored_channels()
-        if message.channel.id in ignored_channels:
+        # Ignore if user has ignored role
+        ignored_roles = settings["ignored_roles"]
+        if ignored_roles and not ignored_roles.isdisjoint(r.id for r in message.author.roles):
             return
 
-        is_emoji = self.is_emoji_only(message.content)
-        member_conf = self.config.member(message.author)
-        guild_conf = self.config.guild(message.guild)
+        is_emoji = self.is_emoji_only(content)
+        current_streak, last_ts = await self._get_streak(message.author)
 
         if not is_emoji:
             # Reset streak on valid engagement
-            await member_conf.streak.set(0)
+            if current_streak:
+                self._set_streak(message.author, 0, last_ts)
             return
 
         # It IS an emoji-only message
         # Check Level
-        user_level = await self.get_user_level(message.author)
-        max_level = await guild_conf.max_level_ignored()
+        # Skip the coroutine entirely when LevelUp is not loaded
+        user_level = await self.get_user_level(message.author) if self._levelup_get_level else 0
+        max_level = settings["max_level_ignored"]
 
         # If user is a high level veteran, ignore them (unless max_level is -1 for everyone)
         if user_level > max_level and max_level != -1:
             return
 
         # Check time window
-        last_ts = await member_conf.last_emoji_ts()
-        now_ts = datetime.datetime.now(datetime.timezone.utc).timestamp()
+        now_ts = time.time()
         
-        window_days = await guild_conf.time_window_days()
+        window_days = settings["time_window_days"]
         window_seconds = window_days * 86400
 
-        current_streak = await member_conf.streak()
-
         if (now_ts - last_ts) > window_seconds:
             # Time window expired, reset streak to 1
             current_streak = 1
         else:
             current_streak += 1
 
-        # Update data
-        await member_conf.last_emoji_ts.set(now_ts)
-        await member_conf.streak.set(current_streak)
-
-        streak_limit = await guild_conf.emoji_streak_limit()
+        streak_limit = settings["emoji_streak_limit"]
 
         if current_streak >= streak_limit:
             # Reset streak so we don't spam warn on every single subsequent emoji
-            await member_conf.streak.set(0)
+            self._set_streak(message.author, 0, now_ts)
             await self.trigger_warning(message.guild, message.author)
+        else:
+            # Update data
+            self._set_streak(message.author, current_streak, now_ts)
 
     async def trigger_warning(self, guild: discord.Guild, member: discord.Member, manual: bool = False):
         """
         Executes the warning logic using WarnSystem.
         """
-        warnsystem = self.bot.get_cog("WarnSystem")
-        if not warnsystem:
+        if not self._warnsystem:
             log.warning("WarnSystem cog not loaded. Cannot warn user.")
             return
 
-        # Get API
-        api = getattr(warnsystem, "api", None)
-        if not api:
+        warn = self._warn_fn
+        if not warn:
             log.warning("WarnSystem API not found.")
             return
 
         member_conf = self.config.member(member)
-        is_flagged = await member_conf.is_flagged()
-        guild_conf = self.config.guild(guild)
+        if self._members_loaded:
+            is_flagged = member.id in self._flagged.get(guild.id, ())
+        else:
+            is_flagged = await member_conf.is_flagged()
+        settings = await self._get_settings(guild)
 
         if not is_flagged and not manual:
             # Level 1 Warn
-            reason_text = await guild_conf.warn_msg_lvl1()
-            link = await guild_conf.warn_msg_lvl1()
-            link_text = await guild_conf.warn_link()
+            reason_text = settings["warn_msg_lvl1"]
+            link_text = settings["warn_link"]
             
             full_reason = f"{reason_text}\nRead more: {link_text}"
             
             try:
                 # Warning Level 1
-                await api.warn(
+                await warn(
                     guild=guild,
                     members=[member],
                     author=guild.me, # Bot is the author
@@ -210,6 +404,7 @@ class LowEngagement(commands.Cog):
                     reason=full_reason
                 )
                 await member_conf.is_flagged.set(True)
+                self._flagged.setdefault(guild.id, set()).add(member.id)
                 log.info(f"LowEngagement: Issued Level 1 warn to {member.id} in {guild.name}")
             except Exception as e:
                 log.error(f"Failed to issue Level 1 warn: {e}")
@@ -221,12 +416,12 @@ class LowEngagement(commands.Cog):
             
             if manual:
                 # Special logic for manual: Give Level 1, set Flag.
-                reason_text = await guild_conf.warn_msg_lvl1()
-                link_text = await guild_conf.warn_link()
+                reason_text = settings["warn_msg_lvl1"]
+                link_text = settings["warn_link"]
                 full_reason = f"[Manual Mark] {reason_text}\nRead more: {link_text}"
 
                 try:
-                    await api.warn(
+                    await warn(
                         guild=guild,
                         members=[member],
                         author=guild.me,
@@ -234,17 +429,18 @@ class LowEngagement(commands.Cog):
                         reason=full_reason
                     )
                     await member_conf.is_flagged.set(True)
+                    self._flagged.setdefault(guild.id, set()).add(member.id)
                     log.info(f"LowEngagement: Manually marked {member.id} in {guild.name}")
                 except Exception as e:
                     log.error(f"Failed to issue Manual Level 1 warn: {e}")
 
             else:
                 # Is Flagged (Repeat offense)
-                reason_text = await guild_conf.warn_msg_lvl3()
+                reason_text = settings["warn_msg_lvl3"]
                 
                 try:
                     # Warning Level 3 (Kick)
-                    await api.warn(
+                    await warn(
                         guild=guild,
                         members=[member],
                         author=guild.me,
@@ -268,6 +464,12 @@ class LowEngagement(commands.Cog):
     async def set_enable(self, ctx, toggle: bool):
         """Enable or disable the cog for this server."""
         await self.config.guild(ctx.guild).enabled.set(toggle)
+        self._invalidate(ctx.guild)
+        if self._enabled_guilds is not None:
+            if toggle:
+                self._enabled_guilds.add(ctx.guild.id)
+            else:
+                self._enabled_guilds.discard(ctx.guild.id)
         await ctx.send(f"LowEngagement enabled: {toggle}")
 
     @lowengagementset.command(name="limit")
@@ -276,6 +478,7 @@ class LowEngagement(commands.Cog):
         if count < 1:
             return await ctx.send("Limit must be at least 1.")
         await self.config.guild(ctx.guild).emoji_streak_limit.set(count)
+        self._invalidate(ctx.guild)
         await ctx.send(f"Streak limit set to {count}.")
 
     @lowengagementset.command(name="days")
@@ -284,53 +487,62 @@ class LowEngagement(commands.Cog):
         if days < 1:
             return await ctx.send("Days must be at least 1.")
         await self.config.guild(ctx.guild).time_window_days.set(days)
+        self._invalidate(ctx.guild)
         await ctx.send(f"Time window set to {days} days.")
 
     @lowengagementset.command(name="level")
     async def set_level(self, ctx, level: int):
         """Set the max LevelUp level. Users above this are ignored. Set -1 to track everyone."""
         await self.config.guild(ctx.guild).max_level_ignored.set(level)
+        self._invalidate(ctx.guild)
         await ctx.send(f"Max level set to {level}.")
 
     @lowengagementset.command(name="reason1")
     async def set_reason1(self, ctx, *, text: str):
         """Set the warning text for the first offense (Level 1)."""
         await self.config.guild(ctx.guild).warn_msg_lvl1.set(text)
+        self._invalidate(ctx.guild)
         await ctx.send("Level 1 warning text updated.")
 
     @lowengagementset.command(name="link")
     async def set_link(self, ctx, link: str):
         """Set the link appended to the Level 1 warning."""
         await self.config.guild(ctx.guild).warn_link.set(link)
+        self._invalidate(ctx.guild)
         await ctx.send("Warning link updated.")
 
     @lowengagementset.command(name="reason3")
     async def set_reason3(self, ctx, *, text: str):
         """Set the warning text for the second offense (Level 3)."""
         await self.config.guild(ctx.guild).warn_msg_lvl3.set(text)
+        self._invalidate(ctx.guild)
         await ctx.send("Level 3 warning text updated.")
 
     @lowengagementset.command(name="ignorechannel")
     async def ignore_channel(self, ctx, channel: discord.TextChannel):
         """Toggle ignoring a specific channel."""
-        async with self.config.guild(ctx.guild).ignored_channels() as ignored:
-            if channel.id in ignored:
-                ignored.remove(channel.id)
-                await ctx.send(f"{channel.mention} is no longer ignored.")
-            else:
-                ignored.append(channel.id)
-                await ctx.send(f"{channel.mention} is now ignored.")
+        ignored = set((await self._get_settings(ctx.guild))["ignored_channels"])
+        if channel.id in ignored:
+            ignored.discard(channel.id)
+            msg = f"{channel.mention} is no longer ignored."
+        else:
+            ignored.add(channel.id)
+            msg = f"{channel.mention} is now ignored."
+        await self._set_ignored(ctx.guild, "ignored_channels", ignored)
+        await ctx.send(msg)
 
     @lowengagementset.command(name="ignorerole")
     async def ignore_role(self, ctx, role: discord.Role):
         """Toggle ignoring a specific role."""
-        async with self.config.guild(ctx.guild).ignored_roles() as ignored:
-            if role.id in ignored:
-                ignored.remove(role.id)
-                await ctx.send(f"`{role.name}` is no longer ignored.")
-            else:
-                ignored.append(role.id)
-                await ctx.send(f"`{role.name}` is now ignored.")
+        ignored = set((await self._get_settings(ctx.guild))["ignored_roles"])
+        if role.id in ignored:
+            ignored.discard(role.id)
+            msg = f"`{role.name}` is no longer ignored."
+        else:
+            ignored.add(role.id)
+            msg = f"`{role.name}` is now ignored."
+        await self._set_ignored(ctx.guild, "ignored_roles", ignored)
+        await ctx.send(msg)
 
     @lowengagementset.command(name="view")
     async def view_settings(self, ctx):
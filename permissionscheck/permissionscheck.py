@@ -1,7 +1,11 @@
 import discord
 from redbot.core import commands, Config
 from redbot.core.utils.chat_formatting import box
-from tabulate import tabulate
+
+# Indexed by the permission bool: False -> 0, True -> 1
+_PERM_STR = ("❌ No", "✅ Yes")
+# Width of the name column in the plain-text checkperms table
+_PERM_NAME_WIDTH = len("Message Pin Permissions")
 
 class PermissionsCheck(commands.Cog):
     """Check a user's permissions in a specific channel."""
@@ -25,14 +29,8 @@ class PermissionsCheck(commands.Cog):
         """View the current configurations for PermissionsCheck."""
         use_embeds = await self.config.guild(ctx.guild).use_embeds()
         
-        # Presenting administrative data in a scannable, code-block table
-        data = [
-            ["Setting", "Current Value"],
-            ["Use Embeds", str(use_embeds)]
-        ]
-        
-        table = tabulate(data, headers="firstrow", tablefmt="fancy_grid")
-        await ctx.send(f"**PermissionsCheck Settings for {ctx.guild.name}**\n{box(table)}")
+        # Single fixed setting, so a static code-block line is all we need
+        await ctx.send(f"**PermissionsCheck Settings for {ctx.guild.name}**\n{box(f'Use Embeds : {use_embeds}')}")
 
     @permissionscheckset.command(name="embeds")
     async def permissionscheckset_embeds(self, ctx, toggle: bool):
@@ -58,9 +56,6 @@ class PermissionsCheck(commands.Cog):
         can_manage = perms.manage_channels or perms.manage_roles or perms.manage_permissions
         can_pin = perms.manage_messages  # Manage messages governs message pinning in standard channels
 
-        def format_perm(has_perm: bool) -> str:
-            return "✅ Yes" if has_perm else "❌ No"
-
         use_embeds = await self.config.guild(ctx.guild).use_embeds()
 
         if use_embeds:
@@ -74,23 +69,24 @@ class PermissionsCheck(commands.Cog):
             avatar_url = member.avatar.url if member.avatar else member.display_avatar.url
             embed.set_thumbnail(url=avatar_url)
             
-            embed.add_field(name="See Channel", value=format_perm(can_see), inline=False)
-            embed.add_field(name="Post Messages", value=format_perm(can_post), inline=False)
-            embed.add_field(name="See Message History", value=format_perm(can_history), inline=False)
-            embed.add_field(name="Manage Permissions", value=format_perm(can_manage), inline=False)
-            embed.add_field(name="Message Pin Permissions", value=format_perm(can_pin), inline=False)
+            embed.add_field(name="See Channel", value=_PERM_STR[can_see], inline=False)
+            embed.add_field(name="Post Messages", value=_PERM_STR[can_post], inline=False)
+            embed.add_field(name="See Message History", value=_PERM_STR[can_history], inline=False)
+            embed.add_field(name="Manage Permissions", value=_PERM_STR[can_manage], inline=False)
+            embed.add_field(name="Message Pin Permissions", value=_PERM_STR[can_pin], inline=False)
             
             await ctx.send(embed=embed)
         else:
             # Fallback for when embeds are disabled, still utilizing a clean table layout
-            data = [
-                ["Permission", "Status"],
-                ["See Channel", format_perm(can_see)],
-                ["Post Messages", format_perm(can_post)],
-                ["See Message History", format_perm(can_history)],
-                ["Manage Permissions", format_perm(can_manage)],
-                ["Message Pin Permissions", format_perm(can_pin)]
-            ]
-            table = tabulate(data, headers="firstrow", tablefmt="fancy_grid")
+            w = _PERM_NAME_WIDTH
+            table = (
+                f"{'Permission'.ljust(w)} | Status\n"
+                f"{'-' * w}-+-------\n"
+                f"{'See Channel'.ljust(w)} | {_PERM_STR[can_see]}\n"
+                f"{'Post Messages'.ljust(w)} | {_PERM_STR[can_post]}\n"
+                f"{'See Message History'.ljust(w)} | {_PERM_STR[can_history]}\n"
+                f"{'Manage Permissions'.ljust(w)} | {_PERM_STR[can_manage]}\n"
+                f"{'Message Pin Permissions'.ljust(w)} | {_PERM_STR[can_pin]}"
+            )
             msg = f"**Permissions for {member.display_name} in {channel.mention}**\n{box(table)}"
             await ctx.send(msg)
\ No newline at end of file
@@ -17,12 +17,51 @@ class Shun(commands.Cog):
         self.bot = bot
         self.config = Config.get_conf(self, identifier=2784539201, force_registration=True)
         
+        default_global = {
+            "schema_version": 1
+        }
         default_guild = {
-            "shuns": {},  # Format: {target_id: {shunner_id: timestamp}}
+            "shuns": {},  # Format: {"target_id:shunner_id": timestamp}
             "allow_self_shun": False
         }
+        self.config.register_global(**default_global)
         self.config.register_guild(**default_guild)
 
+        # In-memory copy of each guild's shuns: {guild_id: {"target:shunner": timestamp}}
+        self._shuns_cache: Dict[int, Dict[str, float]] = {}
+        self._migration = self.bot.loop.create_task(self._migrate_schema())
+
+    @staticmethod
+    def _shun_key(target_id: int, shunner_id: int) -> str:
+        return f"{target_id}:{shunner_id}"
+
+    async def _migrate_schema(self):
+        """Flatten v1 {target: {shunner: ts}} storage into {"target:shunner": ts}."""
+        if await self.config.schema_version() >= 2:
+            return
+        for guild_id, data in (await self.config.all_guilds()).items():
+            old = data.get("shuns") or {}
+            if not any(isinstance(v, dict) for v in old.values()):
+                continue
+            flat = {}
+            for target_id, shunners in old.items():
+                if isinstance(shunners, dict):
+                    for shunner_id, ts in shunners.items():
+                        flat[f"{target_id}:{shunner_id}"] = ts
+                else:
+                    flat[target_id] = shunners
+            await self.config.guild_from_id(guild_id).shuns.set(flat)
+        await self.config.schema_version.set(2)
+
+    async def _get_shuns(self, guild: discord.Guild) -> Dict[str, float]:
+        """Return the cached shuns dict for a guild, loading it from Config once."""
+        await self._migration
+        shuns = self._shuns_cache.get(guild.id)
+        if shuns is None:
+            shuns = await self.config.guild(guild).shuns()
+            self._shuns_cache[guild.id] = shuns
+        return shuns
+
     @commands.group(invoke_without_command=True)
     @commands.guild_only()
     async def shun(self, ctx: commands.Context, target: discord.Member):
@@ -40,7 +79,7 @@ class Shun(commands.Cog):
         """
         Show a list of everyone currently being shunned.
         """
-        shuns = await self.config.guild(ctx.guild).shuns()
+        shuns = await self._get_shuns(ctx.guild)
         
         if not shuns:
             return await ctx.send("No one is currently being shunned. Is nature healing?")
@@ -51,18 +90,26 @@ class Shun(commands.Cog):
         
         # We need to fetch member objects or use names/IDs
         # To avoid massive API spam, we try to resolve from cache or fallback to string ID
+        # The same user often shuns many targets, so each ID is resolved and
+        # stringified only once per listing.
+        get_member = ctx.guild.get_member
+        names: Dict[str, Optional[str]] = {}
+
+        def resolve(id_str: str) -> Optional[str]:
+            if id_str not in names:
+                member = get_member(int(id_str))
+                names[id_str] = str(member) if member else None
+            return names[id_str]
         
-        for target_id_str, shunners_data in shuns.items():
-            if not shunners_data:
-                continue
-                
-            target = ctx.guild.get_member(int(target_id_str))
-            target_name = str(target) if target else f"User ID: {target_id_str}"
+        grouped: Dict[str, list] = {}
+        for key in shuns:
+            target_id_str, shunner_id_str = key.split(":", 1)
+            grouped.setdefault(target_id_str, []).append(shunner_id_str)
+
+        for target_id_str, shunners_data in grouped.items():
+            target_name = resolve(target_id_str) or f"User ID: {target_id_str}"
             
-            shunner_names = []
-            for shunner_id_str in shunners_data.keys():
-                shunner = ctx.guild.get_member(int(shunner_id_str))
-                shunner_names.append(str(shunner) if shunner else f"ID: {shunner_id_str}")
+            shunner_names = [resolve(sid) or f"ID: {sid}" for sid in shunners_data]
             
             # Format the list of shunners to wrap nicely in the table if needed, 
             # but for simplicity in a code block, comma separation is usually best.
@@ -109,18 +156,12 @@ class Shun(commands.Cog):
         
         Reveals how long they were shunned for.
         """
-        async with self.config.guild(ctx.guild).shuns() as shuns:
-            target_id = str(target.id)
-            shunner_id = str(ctx.author.id)
-
-            if target_id not in shuns or shunner_id not in shuns[target_id]:
-                return await ctx.send(f"You are not shunning {target.display_name}.")
+        shuns = await self._get_shuns(ctx.guild)
+        timestamp = shuns.pop(self._shun_key(target.id, ctx.author.id), None)
 
-            timestamp = shuns[target_id].pop(shunner_id)
-            
-            # Clean up empty keys
-            if not shuns[target_id]:
-                del shuns[target_id]
+        if timestamp is None:
+            return await ctx.send(f"You are not shunning {target.display_name}.")
+        await self.config.guild(ctx.guild).shuns.set(shuns)
 
         # Calculate duration
         start_time = datetime.fromtimestamp(timestamp, timezone.utc)
@@ -144,17 +185,14 @@ class Shun(commands.Cog):
         if target.id == self.bot.user.id:
             return await ctx.send("You cannot shun me. I am inevitable.")
 
-        async with self.config.guild(ctx.guild).shuns() as shuns:
-            target_id = str(target.id)
-            shunner_id = str(ctx.author.id)
-
-            if target_id not in shuns:
-                shuns[target_id] = {}
+        shuns = await self._get_shuns(ctx.guild)
+        key = self._shun_key(target.id, ctx.author.id)
 
-            if shunner_id in shuns[target_id]:
-                return await ctx.send(f"You are already shunning {target.display_name}. They know.")
+        if key in shuns:
+            return await ctx.send(f"You are already shunning {target.display_name}. They know.")
 
-            shuns[target_id][shunner_id] = datetime.now(timezone.utc).timestamp()
+        shuns[key] = datetime.now(timezone.utc).timestamp()
+        await self.config.guild(ctx.guild).shuns.set(shuns)
 
         await ctx.send(f"{ctx.author.mention} has shunned {target.mention}.")
 
@@ -191,6 +229,7 @@ class Shun(commands.Cog):
 
         if pred.result:
             await self.config.guild(ctx.guild).shuns.set({})
+            self._shuns_cache[ctx.guild.id] = {}
             await ctx.send("The slate has been wiped clean. Everyone is unshunned.")
         else:
             await ctx.send("Action cancelled.")
@@ -200,11 +239,11 @@ class Shun(commands.Cog):
         """
         View current settings.
         """
-        data = await self.config.guild(ctx.guild).all()
-        allow_self = data['allow_self_shun']
-        shun_count = len(data['shuns'])
+        shuns = await self._get_shuns(ctx.guild)
+        allow_self = await self.config.guild(ctx.guild).allow_self_shun()
+        shun_count = len({key.split(":", 1)[0] for key in shuns})
         
-        total_shuns = sum(len(shunners) for shunners in data['shuns'].values())
+        total_shuns = len(shuns)
 
         settings_info = (
             f"**Allow Self Shun:** {allow_self}\n"
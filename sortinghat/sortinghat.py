@@ -5,11 +5,33 @@ from redbot.core.utils.chat_formatting import box, humanize_list
 import random
 import asyncio
 import logging
+import re
 import time
-from collections import defaultdict
+from collections import deque
+from typing import Deque, Dict, FrozenSet, Optional, Set
 
 log = logging.getLogger("red.NoiselessVolatileLobster.sortinghat")
 
+# Placeholders supported in the greeting message
+GREETING_VAR_RE = re.compile(r"\{(house|member|mention)\}")
+# Anything that looks like a placeholder, used to warn about typos
+PLACEHOLDER_RE = re.compile(r"\{(\w+)\}")
+
+
+def _tokenize_greeting(template: str) -> list:
+    """Split a greeting template into ["lit", text] / ["var", name] tokens."""
+    tokens = []
+    pos = 0
+    for match in GREETING_VAR_RE.finditer(template):
+        if match.start() > pos:
+            tokens.append(["lit", template[pos:match.start()]])
+        tokens.append(["var", match.group(1)])
+        pos = match.end()
+    if pos < len(template):
+        tokens.append(["lit", template[pos:]])
+    return tokens
+
+
 class SortingHat(commands.Cog):
     """
     Sorts users into houses when they reach a specific level.
@@ -25,28 +47,97 @@ class SortingHat(commands.Cog):
             "greeting_channel": None,
             "house_roles": [],  # List of Role IDs
             "sort_level": 2,
-            "greeting_message": "Welcome to {house}, {member}! You have been sorted!"
+            "greeting_message": "Welcome to {house}, {member}! You have been sorted!",
+            "greeting_tokens": None  # Parsed greeting_message, set by [p]shset message
         }
         
         self.config.register_guild(**default_guild)
         
-        # Queue system: {guild_id: [member_id, ...]}
-        self.guild_queues = defaultdict(list)
+        # Queue system: {guild_id: deque([member_id, ...])}
+        # Entries only exist while a guild has queued members.
+        self.guild_queues: Dict[int, Deque[int]] = {}
+        # Members currently queued, for O(1) duplicate checks: {guild_id: {member_id, ...}}
+        self.queued_ids: Dict[int, Set[int]] = {}
         # Active tasks: {guild_id: Task}
         self.active_tasks = {}
+        # Set when work is queued, to wake an idle processor: {guild_id: Event}
+        self._wakeups: Dict[int, asyncio.Event] = {}
         # Last sort time: {guild_id: timestamp}
-        self.last_sort_times = defaultdict(float)
+        self.last_sort_times: Dict[int, float] = {}
+        # Cached guild settings: {guild_id: config.guild(...).all()}
+        self._guild_cache: Dict[int, dict] = {}
+        # Cached house role IDs: {guild_id: {role_id, ...}}
+        self._house_cache: Dict[int, FrozenSet[int]] = {}
+        # Shuffled house role IDs still to be handed out this pass: {guild_id: deque}
+        self._house_ring: Dict[int, Deque[int]] = {}
+        # Whether LevelUp.get_level returns a coroutine; probed on first use
+        self._levelup_is_async: Optional[bool] = None
+        # Guild IDs with SortingHat enabled; None until the startup preload finishes
+        self._enabled_guilds: Optional[Set[int]] = None
+        self.bot.loop.create_task(self._preload())
+
+    def cog_unload(self):
+        for task in self.active_tasks.values():
+            task.cancel()
+        self.active_tasks.clear()
+
+    # Helper: Cached guild settings
+    async def _get_conf(self, guild: discord.Guild) -> dict:
+        conf = self._guild_cache.get(guild.id)
+        if conf is None:
+            conf = self._prepare_conf(await self.config.guild(guild).all())
+            self._guild_cache[guild.id] = conf
+        return conf
+
+    @staticmethod
+    def _prepare_conf(conf: dict) -> dict:
+        # Guilds still on the default message have no stored tokens yet
+        if conf["greeting_tokens"] is None:
+            conf["greeting_tokens"] = _tokenize_greeting(conf["greeting_message"])
+        return conf
+
+    async def _preload(self):
+        """Load settings for every configured guild in one read."""
+        all_guilds = await self.config.all_guilds()
+        for guild_id, conf in all_guilds.items():
+            self._guild_cache.setdefault(guild_id, self._prepare_conf(conf))
+        # "enabled" defaults to False, so every enabled guild has stored settings
+        self._enabled_guilds = {gid for gid, conf in all_guilds.items() if conf["enabled"]}
+
+    def _invalidate(self, guild: discord.Guild):
+        self._guild_cache.pop(guild.id, None)
+        self._house_cache.pop(guild.id, None)
+
+    # Helper: Cached house role IDs
+    async def _get_house_ids(self, guild: discord.Guild) -> FrozenSet[int]:
+        house_ids = self._house_cache.get(guild.id)
+        if house_ids is None:
+            house_ids = frozenset((await self._get_conf(guild))["house_roles"])
+            self._house_cache[guild.id] = house_ids
+        return house_ids
+
+    # Helper: Next house from the shuffled ring
+    def _draw_house(self, guild: discord.Guild) -> Optional[discord.Role]:
+        ring = self._house_ring.get(guild.id)
+        while ring:
+            role = guild.get_role(ring.popleft())
+            if role:
+                return role
+        return None
 
     # Helper: Get Level
-    async def get_member_level(self, member: discord.Member) -> int:
-        levelup = self.bot.get_cog("LevelUp")
+    async def get_member_level(self, member: discord.Member, levelup: Optional[commands.Cog] = None) -> int:
+        if levelup is None:
+            levelup = self.bot.get_cog("LevelUp")
         if not levelup:
             return 0
         
         try:
-            # Check if the method is async or sync to support different versions
+            # Check once whether the method is async or sync to support different versions
             potential_level = levelup.get_level(member)
-            if asyncio.iscoroutine(potential_level):
+            if self._levelup_is_async is None:
+                self._levelup_is_async = asyncio.iscoroutine(potential_level)
+            if self._levelup_is_async:
                 return await potential_level
             return potential_level
         except AttributeError:
@@ -56,30 +147,62 @@ class SortingHat(commands.Cog):
             log.error(f"Error getting level for {member}: {e}")
             return 0
 
+    # Helper: Bulk level fetch
+    async def _get_all_levels(self, guild: discord.Guild, levelup: commands.Cog) -> Optional[dict]:
+        """
+        Fetch every member's level from LevelUp in one call.
+        Returns {member_id: level}, or None if LevelUp offers no bulk access.
+        """
+        get_all_levels = getattr(levelup, "get_all_levels", None)
+        if get_all_levels is None:
+            return None
+        try:
+            val = get_all_levels(guild)
+            if asyncio.iscoroutine(val):
+                val = await val
+            return {int(uid): lvl for uid, lvl in val.items()}
+        except Exception as e:
+            log.debug(f"Bulk level fetch unavailable for {guild.name}: {e}")
+            return None
+
     # Helper: Check if user has a house
     async def get_assigned_house(self, guild: discord.Guild, member: discord.Member) -> discord.Role:
-        house_ids = await self.config.guild(guild).house_roles()
-        for role in member.roles:
-            if role.id in house_ids:
-                return role
-        return None
+        house_ids = await self._get_house_ids(guild)
+        # Scan raw role IDs so Role objects are only resolved for the match
+        matched = next((rid for rid in member._roles if rid in house_ids), None)
+        return guild.get_role(matched) if matched else None
 
     # Helper: Add to Queue
     def enqueue_member(self, guild: discord.Guild, member: discord.Member):
-        if member.id not in self.guild_queues[guild.id]:
-            self.guild_queues[guild.id].append(member.id)
+        queued = self.queued_ids.setdefault(guild.id, set())
+        if member.id not in queued:
+            self.guild_queues.setdefault(guild.id, deque()).append(member.id)
+            queued.add(member.id)
             self._ensure_processor_running(guild)
+            self._wakeups[guild.id].set()
 
     def _ensure_processor_running(self, guild: discord.Guild):
+        self._wakeups.setdefault(guild.id, asyncio.Event())
         if guild.id not in self.active_tasks or self.active_tasks[guild.id].done():
             self.active_tasks[guild.id] = self.bot.loop.create_task(self._process_queue(guild))
 
     async def _process_queue(self, guild: discord.Guild):
         log.info(f"Starting sort queue processor for guild {guild.name} ({guild.id})")
+        wakeup = self._wakeups[guild.id]
+        await self._clean_house_roles(guild)
         
-        while self.guild_queues[guild.id]:
+        while True:
+            # Idle until enqueue_member signals new work
+            if not self.guild_queues.get(guild.id):
+                # Drop the empty per-guild containers while idle
+                self.guild_queues.pop(guild.id, None)
+                self.queued_ids.pop(guild.id, None)
+                wakeup.clear()
+                await wakeup.wait()
+                continue
+
             # Rate limit check
-            last_time = self.last_sort_times[guild.id]
+            last_time = self.last_sort_times.get(guild.id, 0.0)
             now = time.time()
             # 1 hour = 3600 seconds
             elapsed = now - last_time
@@ -89,10 +212,11 @@ class SortingHat(commands.Cog):
                 await asyncio.sleep(wait_time)
 
             # Get next member
-            if not self.guild_queues[guild.id]:
-                break
+            queue = self.guild_queues.get(guild.id)
+            if not queue:
+                continue
                 
-            member_id = self.guild_queues[guild.id].pop(0)
+            member_id = queue.popleft()
             member = guild.get_member(member_id)
 
             if member:
@@ -104,39 +228,45 @@ class SortingHat(commands.Cog):
                     self.last_sort_times[guild.id] = time.time()
                 else:
                     log.info(f"Skipping {member} (already has house)")
+
+            self.queued_ids.get(guild.id, set()).discard(member_id)
             
             # If there are more items, we loop back. 
             # The rate limit check at the top handles the sleep.
 
-        log.info(f"Finished sort queue for guild {guild.name}")
-        if guild.id in self.active_tasks:
-            del self.active_tasks[guild.id]
+    # Helper: Drop deleted roles from the stored house list
+    async def _clean_house_roles(self, guild: discord.Guild) -> int:
+        house_roles = (await self._get_conf(guild))["house_roles"]
+        valid_ids = [rid for rid in house_roles if guild.get_role(rid)]
+        removed = len(house_roles) - len(valid_ids)
+        if removed:
+            await self.config.guild(guild).house_roles.set(valid_ids)
+            self._invalidate(guild)
+            self._house_ring.pop(guild.id, None)
+        return removed
 
     # Helper: Sort Logic
     async def sort_member(self, guild: discord.Guild, member: discord.Member):
-        house_ids = await self.config.guild(guild).house_roles()
+        house_ids = await self._get_house_ids(guild)
         
         if not house_ids:
             return None
 
-        # verify roles exist
-        valid_roles = []
-        clean_config = False
-        for rid in house_ids:
-            role = guild.get_role(rid)
-            if role:
-                valid_roles.append(role)
-            else:
-                clean_config = True
-        
-        if clean_config:
-            await self.config.guild(guild).house_roles.set([r.id for r in valid_roles])
-
-        if not valid_roles:
-            return None
-
         # Pick random house
-        chosen_house = random.choice(valid_roles)
+        chosen_house = self._draw_house(guild)
+        if chosen_house is None:
+            # Ring is empty: deal a fresh shuffled pass of the roles that still exist
+            # (stale IDs are pruned from config by _clean_house_roles, not here)
+            valid_roles = [r for r in (guild.get_role(rid) for rid in house_ids) if r]
+
+            if not valid_roles:
+                return None
+
+            # Each house comes up once per pass, in random order, so houses stay balanced
+            random.shuffle(valid_roles)
+            ring = deque(r.id for r in valid_roles)
+            self._house_ring[guild.id] = ring
+            chosen_house = guild.get_role(ring.popleft())
         
         try:
             await member.add_roles(chosen_house, reason="SortingHat: Level reached")
@@ -147,16 +277,21 @@ class SortingHat(commands.Cog):
             return None
 
         # Send greeting
-        greet_channel_id = await self.config.guild(guild).greeting_channel()
+        conf = await self._get_conf(guild)
+        greet_channel_id = conf["greeting_channel"]
         if greet_channel_id:
             channel = guild.get_channel(greet_channel_id)
             if channel and channel.permissions_for(guild.me).send_messages:
-                msg_template = await self.config.guild(guild).greeting_message()
-                
-                # Replace placeholders
-                message = msg_template.replace("{house}", chosen_house.mention)
-                message = message.replace("{member}", member.mention)
-                message = message.replace("{mention}", member.mention) # Added alias
+                # Fill placeholders from the pre-parsed template
+                values = {
+                    "house": chosen_house.mention,
+                    "member": member.mention,
+                    "mention": member.mention,  # Added alias
+                }
+                message = "".join(
+                    text if kind == "lit" else values[text]
+                    for kind, text in conf["greeting_tokens"]
+                )
                 
                 try:
                     await channel.send(message)
@@ -165,6 +300,16 @@ class SortingHat(commands.Cog):
         
         return chosen_house
 
+    @commands.Cog.listener()
+    async def on_cog_add(self, cog: commands.Cog):
+        if cog.qualified_name == "LevelUp":
+            self._levelup_is_async = None
+
+    @commands.Cog.listener()
+    async def on_cog_remove(self, cog: commands.Cog):
+        if cog.qualified_name == "LevelUp":
+            self._levelup_is_async = None
+
     @commands.Cog.listener()
     async def on_member_levelup(self, guild: discord.Guild, member: discord.Member, message, channel, new_level: int):
         """
@@ -173,13 +318,22 @@ class SortingHat(commands.Cog):
         if member.bot:
             return
 
-        if not await self.config.guild(guild).enabled():
+        # Plain set lookup for the common disabled case, no Config await
+        if self._enabled_guilds is not None and guild.id not in self._enabled_guilds:
+            return
+
+        conf = await self._get_conf(guild)
+        if not conf["enabled"]:
             return
 
-        target_level = await self.config.guild(guild).sort_level()
+        target_level = conf["sort_level"]
 
         # We trigger if they just hit the specific level
         if new_level == target_level:
+            # Already waiting in the queue (e.g. a burst of level-ups)
+            if member.id in self.queued_ids.get(guild.id, ()):
+                return
+
             # Check if they already have a house
             existing_house = await self.get_assigned_house(guild, member)
             if not existing_house:
@@ -196,37 +350,79 @@ class SortingHat(commands.Cog):
     @sortinghatset.command(name="toggle")
     async def sh_toggle(self, ctx):
         """Enable or disable the SortingHat system."""
-        current = await self.config.guild(ctx.guild).enabled()
+        current = (await self._get_conf(ctx.guild))["enabled"]
         await self.config.guild(ctx.guild).enabled.set(not current)
+        self._invalidate(ctx.guild)
+        if self._enabled_guilds is not None:
+            if current:
+                self._enabled_guilds.discard(ctx.guild.id)
+            else:
+                self._enabled_guilds.add(ctx.guild.id)
         state = "enabled" if not current else "disabled"
         await ctx.send(f"SortingHat is now **{state}**.")
 
     @sortinghatset.command(name="addhouse")
     async def sh_addhouse(self, ctx, role: discord.Role):
         """Add a role to be used as a House."""
+        if role.id in await self._get_house_ids(ctx.guild):
+            return await ctx.send(f"{role.name} is already a house.")
         async with self.config.guild(ctx.guild).house_roles() as houses:
             if role.id in houses:
                 return await ctx.send(f"{role.name} is already a house.")
             houses.append(role.id)
+        self._invalidate(ctx.guild)
+        self._house_ring.pop(ctx.guild.id, None)
         await ctx.send(f"Added {role.name} to the list of houses.")
 
+    @sortinghatset.command(name="addhouses")
+    async def sh_addhouses(self, ctx, *roles: discord.Role):
+        """Add several roles to be used as Houses at once."""
+        if not roles:
+            return await ctx.send_help()
+        existing = await self._get_house_ids(ctx.guild)
+        new_roles = [r for r in dict.fromkeys(roles) if r.id not in existing]
+        if not new_roles:
+            return await ctx.send("All of those roles are already houses.")
+
+        houses = list((await self._get_conf(ctx.guild))["house_roles"])
+        houses.extend(r.id for r in new_roles)
+        await self.config.guild(ctx.guild).house_roles.set(houses)
+        self._invalidate(ctx.guild)
+        self._house_ring.pop(ctx.guild.id, None)
+        await ctx.send(f"Added {humanize_list([r.name for r in new_roles])} to the list of houses.")
+
     @sortinghatset.command(name="delhouse")
     async def sh_delhouse(self, ctx, role: discord.Role):
         """Remove a role from the house list."""
+        if role.id not in await self._get_house_ids(ctx.guild):
+            return await ctx.send("That role is not a configured house.")
         async with self.config.guild(ctx.guild).house_roles() as houses:
             if role.id not in houses:
                 return await ctx.send("That role is not a configured house.")
             houses.remove(role.id)
+        self._invalidate(ctx.guild)
+        self._house_ring.pop(ctx.guild.id, None)
         await ctx.send(f"Removed {role.name} from the list of houses.")
 
+    @sortinghatset.command(name="cleanroles")
+    async def sh_cleanroles(self, ctx):
+        """Remove deleted roles from the house list."""
+        removed = await self._clean_house_roles(ctx.guild)
+        if removed:
+            await ctx.send(f"Removed {removed} deleted role(s) from the list of houses.")
+        else:
+            await ctx.send("All configured houses still exist.")
+
     @sortinghatset.command(name="channel")
     async def sh_channel(self, ctx, channel: discord.TextChannel = None):
         """Set the channel for greeting sorted users. Leave empty to disable."""
         if channel:
             await self.config.guild(ctx.guild).greeting_channel.set(channel.id)
+            self._invalidate(ctx.guild)
             await ctx.send(f"Greetings will now be sent in {channel.mention}.")
         else:
             await self.config.guild(ctx.guild).greeting_channel.set(None)
+            self._invalidate(ctx.guild)
             await ctx.send("Greetings disabled.")
 
     @sortinghatset.command(name="level")
@@ -235,6 +431,7 @@ class SortingHat(commands.Cog):
         if level < 1:
             return await ctx.send("Level must be 1 or higher.")
         await self.config.guild(ctx.guild).sort_level.set(level)
+        self._invalidate(ctx.guild)
         await ctx.send(f"Users will now be sorted when they reach level {level}.")
 
     @sortinghatset.command(name="message")
@@ -250,7 +447,18 @@ class SortingHat(commands.Cog):
         Example:
         [p]shset message {member} has been sorted into {house}!
         """
-        await self.config.guild(ctx.guild).greeting_message.set(message)
+        async with self.config.guild(ctx.guild).all() as conf:
+            conf["greeting_message"] = message
+            conf["greeting_tokens"] = _tokenize_greeting(message)
+        self._invalidate(ctx.guild)
+
+        unknown = {
+            name for name in PLACEHOLDER_RE.findall(message)
+            if not GREETING_VAR_RE.fullmatch(f"{{{name}}}")
+        }
+        if unknown:
+            listed = humanize_list([f"`{{{name}}}`" for name in sorted(unknown)])
+            return await ctx.send(f"Greeting message updated. Unknown placeholder(s) {listed} will be shown as-is.")
         await ctx.send("Greeting message updated.")
 
     @sortinghatset.command(name="sortunsorted")
@@ -259,11 +467,12 @@ class SortingHat(commands.Cog):
         Queue all users who meet the level requirement but have no house to be sorted.
         (Processes 1 user per hour to prevent spam).
         """
-        if not self.bot.get_cog("LevelUp"):
+        levelup = self.bot.get_cog("LevelUp")
+        if not levelup:
             return await ctx.send("The 'LevelUp' cog is not loaded. I cannot determine user levels.")
 
-        target_level = await self.config.guild(ctx.guild).sort_level()
-        house_ids = await self.config.guild(ctx.guild).house_roles()
+        target_level = (await self._get_conf(ctx.guild))["sort_level"]
+        house_ids = await self._get_house_ids(ctx.guild)
         
         if not house_ids:
             return await ctx.send("No houses configured! Use `[p]shset addhouse` first.")
@@ -275,33 +484,65 @@ class SortingHat(commands.Cog):
         skipped_already_sorted = 0
 
         async with ctx.typing():
-            for member in ctx.guild.members:
+            candidates = []
+            members = ctx.guild.members
+            total = len(members)
+            for i, member in enumerate(members, 1):
+                # Yield periodically so large guilds don't starve the heartbeat
+                if i % 500 == 0:
+                    await asyncio.sleep(0)
+                    if i % 5000 == 0:
+                        await msg.edit(content=f"Scanning members... {i}/{total}")
+
                 if member.bot:
                     continue
 
-                # 1. Check existing house
-                has_house = False
-                for role in member.roles:
-                    if role.id in house_ids:
-                        has_house = True
-                        break
-                
-                if has_house:
+                # 1. Check existing house (member._roles is the raw role ID list,
+                # which avoids building and sorting member.roles for every member)
+                if not house_ids.isdisjoint(member._roles):
                     skipped_already_sorted += 1
                     continue
 
-                # 2. Check Level
-                lvl = await self.get_member_level(member)
+                candidates.append(member)
+
+            # 2. Check Level
+            all_levels = await self._get_all_levels(ctx.guild, levelup) if candidates else None
+            if all_levels is not None:
+                # One bulk read instead of a lookup per member
+                levels = [all_levels.get(m.id, 0) for m in candidates]
+            elif candidates:
+                # The first lookup also probes whether get_level is sync or async
+                levels = [await self.get_member_level(candidates[0], levelup)]
+                rest = candidates[1:]
+                if self._levelup_is_async:
+                    # Async API: run concurrently, bounded so LevelUp isn't flooded
+                    sem = asyncio.Semaphore(5)
+
+                    async def _level(m: discord.Member) -> int:
+                        async with sem:
+                            return await self.get_member_level(m, levelup)
+
+                    levels.extend(await asyncio.gather(*(_level(m) for m in rest)))
+                else:
+                    # Synchronous API: nothing to overlap, so look levels up in order
+                    for i, m in enumerate(rest, 2):
+                        if i % 500 == 0:
+                            await asyncio.sleep(0)
+                        levels.append(await self.get_member_level(m, levelup))
+            else:
+                levels = []
+
+            for member, lvl in zip(candidates, levels):
                 if lvl < target_level:
                     skipped_low_level += 1
                     continue
 
                 # 3. Add to Queue
-                if member.id not in self.guild_queues[ctx.guild.id]:
+                if member.id not in self.queued_ids.get(ctx.guild.id, ()):
                     self.enqueue_member(ctx.guild, member)
                     added_count += 1
         
-        current_queue_size = len(self.guild_queues[ctx.guild.id])
+        current_queue_size = len(self.guild_queues.get(ctx.guild.id, ()))
         
         summary = (
             f"**Scan Complete**\n"
@@ -330,7 +571,7 @@ class SortingHat(commands.Cog):
         channel = ctx.guild.get_channel(conf['greeting_channel'])
         channel_str = channel.mention if channel else "None"
         
-        queue_len = len(self.guild_queues[ctx.guild.id])
+        queue_len = len(self.guild_queues.get(ctx.guild.id, ()))
         
         desc = (
             f"**Enabled:** {conf['enabled']}\n"
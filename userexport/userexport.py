@@ -1,12 +1,19 @@
 import discord
+import asyncio
+import functools
+import gzip
+import heapq
 import io
 import datetime
+from operator import itemgetter
 from typing import Optional, List
 
 from redbot.core import commands, checks, Config
 from redbot.core.utils.chat_formatting import box
 from redbot.core.bot import Red
 
+TIMESTAMP_FMT = "%Y-%m-%d %H:%M:%S"
+
 class UserExport(commands.Cog):
     """
     Export messages from a specific user to a text file.
@@ -94,9 +101,10 @@ class UserExport(commands.Cog):
 
         # Calculate the cutoff time
         cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=days)
-        ignored_list = await self.config.guild(ctx.guild).ignored_channels()
+        ignored_list = frozenset(await self.config.guild(ctx.guild).ignored_channels())
         
-        messages_found = []
+        # One oldest-first list of (created_at, entry) per channel
+        per_channel: List[list] = []
         channels_scanned = 0
         
         progress_msg = await ctx.send(
@@ -104,71 +112,113 @@ class UserExport(commands.Cog):
             "I am scanning all text channels. This may take a moment..."
         )
         
+        # Independent channels are paginated concurrently; 5 at a time keeps
+        # us well inside Discord's per-route rate limits
+        sem = asyncio.Semaphore(5)
+        user_id = user.id
+
+        async def scan(channel: discord.TextChannel) -> list:
+            found = []
+            channel_tag = f"[#{channel.name}]"
+            async with sem:
+                # Scan history (after= bounds pagination to the export window,
+                # oldest_first keeps this channel's list in timestamp order)
+                async for message in channel.history(limit=None, after=cutoff, oldest_first=True):
+                    # Most messages belong to other users; drop them before touching
+                    # clean_content or any other formatting
+                    if message.author.id != user_id:
+                        continue
+
+                    # Format: Timestamp | Channel | Content
+                    timestamp_str = message.created_at.strftime(TIMESTAMP_FMT)
+                    
+                    # Clean up content (remove newlines to keep it 1 line per message mostly).
+                    # clean_content only rewrites <@..>/<#..> mentions and @everyone/@here,
+                    # so skip its resolution work when the raw text has neither marker.
+                    raw = message.content
+                    if "<" in raw or "@" in raw:
+                        raw = message.clean_content
+                    clean_content = raw.replace("\n", "  ")
+                    
+                    entry = f"[{timestamp_str}] {channel_tag}: {clean_content}"
+                    
+                    # Append attachment links if present
+                    if message.attachments:
+                        att_list = ", ".join([a.url for a in message.attachments])
+                        entry += f" [Attachments: {att_list}]"
+                        
+                    found.append((message.created_at, entry))
+            return found
+
         async with ctx.typing():
-            for channel in ctx.guild.text_channels:
-                # Skip ignored channels
-                if channel.id in ignored_list:
-                    continue
-                
-                # Check if bot has permissions to read history
-                perms = channel.permissions_for(ctx.guild.me)
-                if not perms.read_message_history or not perms.read_messages:
-                    continue
+            # Skip ignored channels, then check if bot has permissions to read history
+            # (the cheap set test runs first; permissions_for is computed once per channel)
+            me = ctx.guild.me
+            eligible_channels = [
+                channel for channel in ctx.guild.text_channels
+                if channel.id not in ignored_list
+                and (perms := channel.permissions_for(me)).read_message_history
+                and perms.read_messages
+            ]
 
-                channels_scanned += 1
-                try:
-                    # Scan history
-                    async for message in channel.history(limit=None, after=cutoff):
-                        if message.author.id == user.id:
-                            # Format: Timestamp | Channel | Content
-                            timestamp_str = message.created_at.strftime("%Y-%m-%d %H:%M:%S")
-                            
-                            # Clean up content (remove newlines to keep it 1 line per message mostly)
-                            clean_content = message.clean_content.replace("\n", "  ")
-                            
-                            entry = f"[{timestamp_str}] [#{channel.name}]: {clean_content}"
-                            
-                            # Append attachment links if present
-                            if message.attachments:
-                                att_list = ", ".join([a.url for a in message.attachments])
-                                entry += f" [Attachments: {att_list}]"
-                                
-                            messages_found.append((message.created_at, entry))
-                except Exception:
-                    # Silently skip channels that cause errors (e.g. unexpected perm issues)
+            channels_scanned = len(eligible_channels)
+            results = await asyncio.gather(*(scan(c) for c in eligible_channels), return_exceptions=True)
+            for result in results:
+                # Silently skip channels that cause errors (e.g. unexpected perm issues)
+                if isinstance(result, BaseException):
                     continue
+                if result:
+                    per_channel.append(result)
 
-        if not messages_found:
+        total_messages = sum(len(found) for found in per_channel)
+        if not total_messages:
             await progress_msg.edit(content=f"No messages found for **{user.display_name}** in the last {days} days.")
             return
 
-        # Sort messages by timestamp (Oldest to Newest)
-        messages_found.sort(key=lambda x: x[0])
+        # Each channel is already sorted, so merge them by timestamp (Oldest to Newest)
+        merged = heapq.merge(*per_channel, key=itemgetter(0))
         
-        # Write to memory buffer
-        output_buffer = io.StringIO()
+        # Build the file in one join + encode, then wrap it for upload
         header = (
             f"User Export for: {user.display_name} ({user.id})\n"
             f"Date Generated: {datetime.datetime.now()}\n"
             f"Range: Last {days} days\n"
-            f"Total Messages: {len(messages_found)}\n"
+            f"Total Messages: {total_messages}\n"
             f"Channels Scanned: {channels_scanned}\n"
             f"--------------------------------------------------\n\n"
         )
-        output_buffer.write(header)
-        
-        for _, entry in messages_found:
-            output_buffer.write(entry + "\n")
-            
-        output_buffer.seek(0)
+        chunks = [header]
+        chunks.extend(entry + "\n" for _, entry in merged)
+        payload = "".join(chunks).encode("utf-8")
+        del chunks
+        filename = f"export_{user.name}_{datetime.date.today()}.txt"
+
+        # Chat logs compress several times over, so gzip anything over the
+        # guild's upload limit rather than failing the upload outright
+        upload_limit = ctx.guild.filesize_limit
+        if len(payload) > upload_limit:
+            # Compressing tens of MB takes seconds; keep it off the event loop
+            payload = await self.bot.loop.run_in_executor(
+                None, functools.partial(gzip.compress, payload, compresslevel=6)
+            )
+            filename += ".gz"
+            if len(payload) > upload_limit:
+                await progress_msg.edit(
+                    content=(
+                        f"Found **{total_messages}** messages, but the export is too large to upload "
+                        f"even when compressed. Try a shorter range of days."
+                    )
+                )
+                return
+
+        output_buffer = io.BytesIO(payload)
         
         # Send file
         try:
-            filename = f"export_{user.name}_{datetime.date.today()}.txt"
             file_obj = discord.File(output_buffer, filename=filename)
             await progress_msg.delete()
             await ctx.send(
-                f"Export complete. Found **{len(messages_found)}** messages in **{channels_scanned}** channels.",
+                f"Export complete. Found **{total_messages}** messages in **{channels_scanned}** channels.",
                 file=file_obj
             )
         except discord.HTTPException: